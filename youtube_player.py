@@ -10,9 +10,6 @@ from tkinter import (
     Tk, Menu, Frame, Label, Button, Scale, Entry, DISABLED, StringVar,
     filedialog
 )
-from youtube_search import YoutubeSearch
-import vlc
-import yt_dlp
 
 MAX_SEARCH_RESULTS = 40
 MAX_SONG_LENGTH = 300
@@ -49,10 +46,24 @@ class YouTubePlayer:
     '''
     def __init__(self, short_song: bool=False):
         self.short_song_ = short_song
-        self.vlc_instance = vlc.Instance()
-        self.player = self.vlc_instance.media_player_new()
+        self.vlc_instance = None
+        self.player_ = None
+        self.volume_ = None
+
+    @property
+    def player(self):
+        # vlc, yt_dlp and youtube_search are imported on first use, so the
+        # window is on screen without waiting for them
+        if self.player_ is None:
+            import vlc
+            self.vlc_instance = vlc.Instance()
+            self.player_ = self.vlc_instance.media_player_new()
+            if self.volume_ is not None:
+                self.player_.audio_set_volume(self.volume_)
+        return self.player_
 
     def search(self, search_query):
+        from youtube_search import YoutubeSearch
         results = YoutubeSearch(
             search_query, max_results=MAX_SEARCH_RESULTS
         ).to_dict()
@@ -71,6 +82,7 @@ class YouTubePlayer:
         return song_list
 
     def get_audio_urls(self, url):
+        import yt_dlp
         audio_urls = []
         with yt_dlp.YoutubeDL({}) as ydl:
             info = ydl.extract_info(url, download=False)
@@ -85,9 +97,10 @@ class YouTubePlayer:
         return audio_urls, title
 
     def get_player(self, url):
+        player = self.player
         media = self.vlc_instance.media_new(url)
         media.get_mrl()
-        self.player.set_media(media)
+        player.set_media(media)
 
     def play(self):
         self.player.play()
@@ -103,25 +116,30 @@ class YouTubePlayer:
     def short_song(self, val: bool) -> None:
         self.short_song_ = val
 
+    # until a song is played there is no player, polling the time and
+    # setting the volume must not import vlc
     @property
     def length(self):
-        return self.player.get_length()
+        return self.player_.get_length() if self.player_ else 0
 
     @property
     def time(self):
-        return self.player.get_time()
+        return self.player_.get_time() if self.player_ else 0
 
     @time.setter
     def time(self, val):
-        self.player.set_time(val)
+        if self.player_:
+            self.player_.set_time(val)
 
     @property
     def volume(self):
-        self.player.audio_get_volume()
+        return self.player_.audio_get_volume() if self.player_ else self.volume_
 
     @volume.setter
     def volume(self, val):
-        self.player.audio_set_volume(int(val))
+        self.volume_ = int(val)
+        if self.player_:
+            self.player_.audio_set_volume(self.volume_)
 
     def download(self, url, title):
         ''' download method is not implemented
@@ -137,6 +155,7 @@ class YouTubePlayer:
                 {'key': 'FFmpegMetadata'},
             ],
         }
+        import yt_dlp
         with yt_dlp.YoutubeDL(ydl_options) as ydl:
             _ = ydl.extract_info(YOUTUBE_BASE_URL + url, download=True)
 
@@ -201,7 +220,7 @@ class TkGuiPlayer:
         self.set_pl_frame()
         self.pl_show_title()
         self.set_status_frame()
-        self.poll_song_status()
+        self.window.after(self.poll_time, self.poll_song_status)
         self.window.mainloop()
 
     def set_menubar(self):
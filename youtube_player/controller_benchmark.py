@@ -0,0 +1,109 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import io
+import time
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+from youtube_player.backend import NullBackend, SimulatedClock
+from youtube_player.controller import Controller
+from youtube_player.daemon import NullView
+from youtube_player.formats import AudioFormat
+from youtube_player.model import YouTubePlayerModel
+from youtube_player.song import Song
+
+TRACKS = 5000
+TRACK_MS = 1000
+
+
+class FakeExtractor:
+    ''' Stand-in for yt_dlp.YoutubeDL that resolves any video at once
+    '''
+    def __init__(self, options=None):
+        self.options = options
+
+    def __exit__(self, *args):
+        pass
+
+    def extract_info(self, url, download=False):
+        video_id = url.rsplit('=', 1)[-1]
+        return {
+            'id': video_id, 'title': video_id, 'duration': TRACK_MS // 1000,
+            'formats': [{
+                'resolution': 'audio only', 'format_id': '251', 'abr': 135.2,
+                'acodec': 'opus', 'protocol': 'https',
+                'url': f'https://media.test/{video_id}/251',
+            }],
+        }
+
+
+def run(tracks, track_ms, directory, cached=True):
+    ''' play tracks songs of track_ms with autoplay on a NullBackend, driving
+        the clock and the dispatcher as the gui loop would. Returns the
+        seconds taken, the seconds from the end of each song until the next
+        one played, and the prefetch stats
+    '''
+    clock = SimulatedClock()
+    model = YouTubePlayerModel(
+        cache_file=Path(directory) / 'cache.sqlite', download_dir=Path(directory) / 'music',
+        library_file=Path(directory) / 'library.json',
+        backend=lambda: NullBackend(clock, lambda url: track_ms), clock=clock)
+    model.extractors.factory = FakeExtractor
+    songs = [Song(f'{index:011d}', f'song {index}', track_ms // 1000) for index in range(tracks)]
+    if cached:
+        for song in songs:
+            model.stream_cache.put(
+                song.video_id, [AudioFormat(f'https://media.test/{song.video_id}/251', 135.2, 'opus')],
+                song.title)
+
+    controller = Controller(model, NullView())
+    controller.set_initial_values()
+    controller.querylist = songs
+    controller.import_all_to_playlist()
+    latencies = []
+    start = time.perf_counter()
+    controller.pl_play_next()
+    for _ in range(tracks - 1):
+        playing = controller.current_song
+        ended = time.perf_counter()
+        clock.advance(track_ms * 0.001)
+        while controller.current_song is playing or controller.busy:
+            if not controller.dispatch_callbacks():
+                time.sleep(0)
+        latencies.append(time.perf_counter() - ended)
+
+    elapsed = time.perf_counter() - start
+    stats = controller.prefetch_stats()
+    controller.quit()
+    return elapsed, latencies, stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='tracks per second and song change latency of the controller, headless')
+    parser.add_argument('--tracks', type=int, default=TRACKS, help=f'default {TRACKS}')
+    parser.add_argument(
+        '--track-ms', type=int, default=TRACK_MS, help=f'length of a track, default {TRACK_MS}')
+    parser.add_argument(
+        '--uncached', action='store_true', help='resolve every song with the fake extractor')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        elapsed, latencies, stats = run(args.tracks, args.track_ms, directory, not args.uncached)
+
+    latencies.sort()
+    print(f'{args.tracks} tracks in {elapsed:.2f} s: {args.tracks / elapsed:.0f} tracks/s')
+    print(f'song change: median {latencies[len(latencies) // 2] * 1000:.3f} ms, '
+          f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:.3f} ms, '
+          f'max {latencies[-1] * 1000:.3f} ms')
+    print(f'prefetch: {stats}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import time
+import argparse
+from youtube_player.model import ExtractorPool
+
+CALLS = 200
+SETUP_MS = 20.0
+EXTRACT_MS = 1.0
+
+
+class FakeExtractor:
+    ''' Stand-in for yt_dlp.YoutubeDL: making one takes setup seconds, like
+        loading the extractors and setting up the url opener, and extract_info
+        takes extract seconds
+    '''
+    setup = SETUP_MS * 0.001
+    extract = EXTRACT_MS * 0.001
+
+    def __init__(self, options=None):
+        self.options = options
+        time.sleep(self.setup)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def extract_info(self, url, download=False):
+        time.sleep(self.extract)
+        return {'id': url.rsplit('=', 1)[-1], 'formats': []}
+
+
+def per_call(calls):
+    ''' seconds for calls extractions with a new instance per call, as before
+        the pool
+    '''
+    start = time.perf_counter()
+    for index in range(calls):
+        with FakeExtractor({}) as ydl:
+            ydl.extract_info(f'https://www.youtube.com/watch?v={index}')
+    return time.perf_counter() - start
+
+
+def pooled(calls):
+    ''' seconds for calls extractions on instances of an ExtractorPool
+    '''
+    pool = ExtractorPool({}, factory=FakeExtractor)
+    start = time.perf_counter()
+    for index in range(calls):
+        with pool.extractor() as ydl:
+            ydl.extract_info(f'https://www.youtube.com/watch?v={index}')
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return elapsed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='extractions with a YoutubeDL per call against a pool of them')
+    parser.add_argument('--calls', type=int, default=CALLS, help=f'default {CALLS}')
+    parser.add_argument(
+        '--setup', type=float, default=SETUP_MS, help=f'ms to make an extractor, default {SETUP_MS}')
+    parser.add_argument(
+        '--extract', type=float, default=EXTRACT_MS, help=f'ms per extraction, default {EXTRACT_MS}')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    FakeExtractor.setup = args.setup * 0.001
+    FakeExtractor.extract = args.extract * 0.001
+    for name, run in (('per call', per_call), ('pooled', pooled)):
+        elapsed = run(args.calls)
+        print(f'{name:>8}: {elapsed:.3f} s, {elapsed / args.calls * 1000:.2f} ms per call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import argparse
+import tracemalloc
+from youtube_player.playlist import Playlist
+from youtube_player.song import Song, format_duration
+
+SONGS = 100_000
+TITLES = 5_000
+
+
+def song_dicts(count):
+    # the songs before the records: a dict per song with the watch url and
+    # the duration as text; titles recur as in real playlists
+    return [
+        {'url': f'https://www.youtube.com/watch?v={index:011d}',
+         'title': f'title {index % TITLES} of a song',
+         'duration': format_duration(200 + index % 300)}
+        for index in range(count)
+    ]
+
+
+def song_records(count):
+    return [
+        Song(f'{index:011d}', f'title {index % TITLES} of a song', 200 + index % 300)
+        for index in range(count)
+    ]
+
+
+def playlist(count):
+    return Playlist(
+        Song(f'{index:011d}', f'title {index % TITLES} of a song', 200 + index % 300)
+        for index in range(count))
+
+
+def allocated(make, count):
+    ''' bytes held by the result of make(count)
+    '''
+    tracemalloc.start()
+    result = make(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='memory of the songs of a large playlist')
+    parser.add_argument('--songs', type=int, default=SONGS, help=f'default {SONGS}')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f'{args.songs} songs')
+    for name, make in (('dicts', song_dicts), ('Song records', song_records),
+                       ('Playlist columns', playlist)):
+        size = allocated(make, args.songs)
+        print(f'{name:>16}: {size / 2**20:.1f} MiB, {size / args.songs:.0f} bytes per song')
+
+
+if __name__ == '__main__':
+    main()
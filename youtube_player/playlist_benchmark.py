@@ -0,0 +1,98 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import time
+import random
+import argparse
+from collections import deque
+from youtube_player.playlist import Playlist
+from youtube_player.song import Song
+
+ENTRIES = 50_000
+EDITS = 500
+
+
+def song_dicts(entries):
+    return [
+        {'url': f'https://www.youtube.com/watch?v={index:011d}', 'title': f'song {index}',
+         'duration': '3:20'}
+        for index in range(entries)
+    ]
+
+
+def deque_edits(entries, edits, rng):
+    # the playlist before the cursor: a list of dicts in the model and a
+    # rotated deque copy in the controller, made again on every removal, and
+    # a scan for the index of a song to move to
+    songs = song_dicts(entries)
+    playlist = deque(songs)
+    rotations = 0
+    start = time.perf_counter()
+    for _ in range(edits):
+        rotations = rng.randrange(len(songs))
+        del songs[len(songs) - rotations if rotations > 0 else 0]
+        playlist = deque(songs)
+        playlist.rotate(rotations)
+        url = songs[rng.randrange(len(songs))]['url']
+        index = next((index for index, song in enumerate(playlist) if song['url'] == url), 0)
+        playlist.rotate(-index)
+    return time.perf_counter() - start
+
+
+def playlist_edits(entries, edits, rng, duplicates=False):
+    # the cursor playlist: a removal at the cursor and a move to a song by its
+    # video id, as a shuffled removal does
+    songs = [Song(f'{index:011d}', f'song {index}', 200) for index in range(entries)]
+    if duplicates:
+        songs += songs[:edits]
+    playlist = Playlist(songs)
+    playlist.position(playlist.video_ids[0])
+    start = time.perf_counter()
+    for _ in range(edits):
+        playlist.move_to(rng.randrange(len(playlist)) if not duplicates else 0)
+        playlist.remove(playlist.cursor)
+        playlist.move_to(playlist.position(playlist.video_ids[rng.randrange(len(playlist))]))
+    return time.perf_counter() - start
+
+
+def column_parts(entries, edits, rng):
+    # the O(n) parts of a removal: deleting from the columns, and the scan
+    # for the next entry of a video id that is in the playlist twice
+    video_ids = [f'{index:011d}' for index in range(entries)]
+    start = time.perf_counter()
+    for _ in range(edits):
+        del video_ids[rng.randrange(len(video_ids))]
+    deleted = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(edits):
+        video_ids.index(video_ids[-1])
+    return deleted, time.perf_counter() - start
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='time playlist edits of the deque playlist against the cursor playlist')
+    parser.add_argument('--entries', type=int, default=ENTRIES, help=f'default {ENTRIES}')
+    parser.add_argument('--edits', type=int, default=EDITS, help=f'default {EDITS}')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    def report(name, elapsed):
+        print(f'{name:>28}: {elapsed / args.edits * 1000:.4f} ms per edit')
+
+    print(f'{args.entries} entries, {args.edits} edits of a removal and a move')
+    report('deque', deque_edits(args.entries, args.edits, random.Random(1)))
+    report('cursor playlist', playlist_edits(args.entries, args.edits, random.Random(1)))
+    report('cursor playlist, duplicates',
+           playlist_edits(args.entries, args.edits, random.Random(1), duplicates=True))
+    deleted, scanned = column_parts(args.entries, args.edits, random.Random(1))
+    report('del of a column entry', deleted)
+    report('index scan of a column', scanned)
+
+
+if __name__ == '__main__':
+    main()
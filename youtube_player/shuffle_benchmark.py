@@ -0,0 +1,69 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import time
+import random
+import argparse
+from youtube_player.shuffle import ShuffleSet, ShuffleOrder
+from youtube_player.playlist import Playlist
+from youtube_player.song import Song
+
+ENTRIES = 100_000
+SKIPS = 200
+
+
+def list_skip(video_ids, not_played, rng):
+    # the selection before the shuffle set: a list of the set to choose from
+    # and a scan of the playlist for the index of the song
+    video_id = rng.choice(list(not_played))
+    not_played.discard(video_id)
+    return next((index for index, id_ in enumerate(video_ids) if id_ == video_id), 0)
+
+
+def set_skip(playlist, not_played):
+    video_id = not_played.choice()
+    not_played.discard(video_id)
+    return playlist.position(video_id)
+
+
+def order_skip(playlist, order):
+    return playlist.position(order.next())
+
+
+def per_skip(skip, skips):
+    ''' mean milliseconds per call of skip over skips calls
+    '''
+    start = time.perf_counter()
+    for _ in range(skips):
+        skip()
+    return (time.perf_counter() - start) / skips * 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='time a shuffled skip on a large playlist')
+    parser.add_argument('--entries', type=int, default=ENTRIES, help=f'default {ENTRIES}')
+    parser.add_argument('--skips', type=int, default=SKIPS, help=f'default {SKIPS}')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    playlist = Playlist(Song(f'{index:011d}', f'song {index}', 200) for index in range(args.entries))
+    rng = random.Random(1)
+    not_played = set(playlist.video_ids)
+    shuffle_set = ShuffleSet(playlist.video_ids, rng=random.Random(1))
+    order = ShuffleOrder(playlist, seed=1)
+    playlist.position(playlist.video_ids[0])
+    results = (
+        ('list', lambda: list_skip(playlist.video_ids, not_played, rng)),
+        ('shuffle set', lambda: set_skip(playlist, shuffle_set)),
+        ('shuffle order', lambda: order_skip(playlist, order)),
+    )
+    print(f'{args.entries} entries, {args.skips} skips')
+    for name, skip in results:
+        print(f'{name:>13}: {per_skip(skip, args.skips):.4f} ms per skip')
+
+
+if __name__ == '__main__':
+    main()
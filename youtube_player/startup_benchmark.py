@@ -0,0 +1,73 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import re
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+STARTUP_MODULES = ('youtube_player.model', 'youtube_player.controller', 'youtube_player.view')
+DEFERRED_MODULES = ('vlc', 'yt_dlp', 'youtube_search')
+BUDGET_MS = 150
+RUNS = 5
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def import_times(modules=STARTUP_MODULES):
+    ''' cumulative import time in microseconds of each top level module
+        imported by a fresh interpreter importing modules, from the output of
+        python -X importtime; the modules of the interpreter start up itself
+        are included
+    '''
+    code = f'import {", ".join(modules)}' if modules else 'pass'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if (match := IMPORT_TIME.match(line)) and len(match.group(3)) == 1:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def measure(runs=RUNS):
+    ''' best startup time in milliseconds over runs, and the deferred modules
+        that were imported at startup
+    '''
+    best = None
+    imported = set()
+    interpreter = set(import_times(()))
+    for _ in range(runs):
+        times = import_times()
+        total = sum(
+            micros for module, micros in times.items() if module not in interpreter) * 0.001
+        best = total if best is None else min(best, total)
+        imported.update(module for module in DEFERRED_MODULES if module in times)
+    return best, sorted(imported)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='time the imports of the player at startup against a budget')
+    parser.add_argument(
+        '--budget', type=float, default=BUDGET_MS, help=f'budget in ms, default {BUDGET_MS}')
+    parser.add_argument(
+        '--runs', type=int, default=RUNS, help=f'number of runs, the best counts, default {RUNS}')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    best, imported = measure(args.runs)
+    print(f'startup imports: {best:.1f} ms, budget {args.budget:.1f} ms')
+    if imported:
+        print(f'imported at startup, should be deferred: {", ".join(imported)}')
+
+    return 1 if imported or best > args.budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
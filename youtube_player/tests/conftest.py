@@ -0,0 +1,162 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from youtube_player.backend import NullBackend, SimulatedClock
+from youtube_player.controller import Controller
+from youtube_player.model import YouTubePlayerModel
+from youtube_player.song import Song
+
+AUDIO_FORMATS = (
+    ('139', 48.8, 'mp4a.40.5'), ('249', 50.3, 'opus'), ('250', 70.1, 'opus'),
+    ('140', 129.5, 'mp4a.40.2'), ('251', 135.2, 'opus'),
+)
+
+
+class FakeYoutubeDL:
+    ''' Stand-in for yt_dlp.YoutubeDL: extract_info returns the audio formats
+        of AUDIO_FORMATS for any watch url, after delay seconds. Video ids in
+        unavailable raise like yt-dlp does for a removed video, all videos
+        raise a network error while offline is set; every call is
+        recorded in calls. The urls carry the number of the call, so a video
+        resolved again gets new urls like signed googlevideo urls do
+    '''
+    delay = 0.0
+    unavailable = set()
+    offline = False
+    calls = []
+    lock = threading.Lock()
+
+    def __init__(self, options=None):
+        self.options = options
+
+    def __exit__(self, *args):
+        pass
+
+    def extract_info(self, url, download=False):
+        with self.lock:
+            self.calls.append(url)
+            count = len(self.calls)
+        time.sleep(self.delay)
+        video_id = url.rsplit('=', 1)[-1]
+        if self.offline:
+            raise RuntimeError('Unable to download webpage: network is unreachable')
+
+        if video_id in self.unavailable:
+            raise RuntimeError(f'{video_id}: Video unavailable')
+
+        return {
+            'id': video_id,
+            'title': f'title of {video_id}',
+            'duration': 200,
+            'formats': [
+                {
+                    'resolution': 'audio only', 'format_id': format_id, 'abr': abr,
+                    'acodec': codec, 'protocol': 'https',
+                    'url': f'https://media.test/{video_id}/{format_id}?call={count}',
+                }
+                for format_id, abr, codec in AUDIO_FORMATS
+            ] + [{'resolution': '640x360', 'url': f'https://media.test/{video_id}/18'}],
+        }
+
+
+class FakeView:
+    ''' View that records what a gui would show
+    '''
+    progress_bar_resolution = 0.001
+
+    def __init__(self):
+        self.current_titles = []
+        self.pl_titles = []
+        self.query_titles = []
+        self.warm_progress = None
+        self.download_progress = None
+        self.autoplay_toggles = 0
+        self.controller = None
+
+    def pl_show_title(self, title):
+        self.pl_titles.append(title)
+
+    def pl_show_current_title(self, title, quality):
+        self.current_titles.append((title, quality))
+
+    def query_show_title(self, title):
+        self.query_titles.append(title)
+
+    def show_warm_progress(self, done, total, dead):
+        self.warm_progress = (done, total, dead)
+
+    def show_download_progress(self, done, total):
+        self.download_progress = (done, total)
+
+    def toggle_autoplay(self):
+        self.autoplay_toggles += 1
+        self.controller.toggle_autoplay()
+
+    def exit(self):
+        pass
+
+
+def songs(count, seconds=200, prefix='v'):
+    return [Song(f'{prefix}{index}', f'song {index}', seconds) for index in range(count)]
+
+
+def settle(controller, timeout=5.0):
+    ''' dispatch callbacks until the workers of controller are idle
+    '''
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not controller.dispatch_callbacks() and not controller.busy:
+            return
+
+        time.sleep(0.002)
+
+    raise TimeoutError('controller still busy')
+
+
+@pytest.fixture
+def fake_ydl():
+    FakeYoutubeDL.delay = 0.0
+    FakeYoutubeDL.unavailable = set()
+    FakeYoutubeDL.offline = False
+    FakeYoutubeDL.calls = []
+    return FakeYoutubeDL
+
+
+@pytest.fixture
+def clock():
+    return SimulatedClock()
+
+
+@pytest.fixture
+def model(tmp_path, clock, fake_ydl):
+    model = YouTubePlayerModel(
+        cache_file=tmp_path / 'cache.sqlite', download_dir=tmp_path / 'music',
+        library_file=tmp_path / 'library.json',
+        backend=lambda: NullBackend(clock), clock=clock)
+    model.extractors.factory = fake_ydl
+    model.warm_extractors.factory = fake_ydl
+    return model
+
+
+@pytest.fixture
+def view():
+    return FakeView()
+
+
+@pytest.fixture
+def controller(model, view):
+    controller = Controller(model, view)
+    view.controller = controller
+    controller.set_initial_values()
+    yield controller
+    controller.quit()
@@ -0,0 +1,77 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import gc
+import sys
+import types
+import weakref
+
+import pytest
+
+from youtube_player.backend import VlcBackend, NullBackend, SimulatedClock
+
+
+class FakeEventManager:
+    def __init__(self):
+        self.handlers = {}
+
+    def event_attach(self, event_type, handler):
+        self.handlers[event_type] = handler
+
+
+class FakeMediaPlayer:
+    def __init__(self):
+        self.volume = None
+
+    def event_manager(self):
+        # like python-vlc, a new manager on every call
+        return FakeEventManager()
+
+    def audio_set_volume(self, volume):
+        self.volume = volume
+
+
+@pytest.fixture
+def fake_vlc(monkeypatch):
+    vlc = types.ModuleType('vlc')
+    vlc.EventType = types.SimpleNamespace(
+        MediaPlayerEndReached='end', MediaPlayerEncounteredError='error',
+        MediaPlayerBuffering='buffering', MediaPlayerLengthChanged='length',
+        MediaPlayerTimeChanged='time')
+    vlc.Instance = lambda: types.SimpleNamespace(media_player_new=FakeMediaPlayer)
+    monkeypatch.setitem(sys.modules, 'vlc', vlc)
+    monkeypatch.setattr(VlcBackend, 'instance', None)
+    return vlc
+
+
+def test_vlc_backend_is_lazy(fake_vlc):
+    backend = VlcBackend()
+    assert backend.player_ is None and backend.time == 0
+    backend.volume = 40
+    assert backend.player.volume == 40
+
+
+def test_vlc_event_manager_lives_with_the_backend(fake_vlc):
+    backend = VlcBackend()
+    events = []
+    backend.attach(lambda event, value: events.append(event))
+    assert backend.player is not None
+    manager = weakref.ref(backend.events)
+    gc.collect()
+    assert manager() is not None
+    manager().handlers['end'](None)
+    assert events == ['end']
+
+
+def test_null_backend_plays_on_the_clock():
+    clock = SimulatedClock()
+    backend = NullBackend(clock, lengths=lambda url: 1000)
+    events = []
+    backend.attach(lambda event, value: events.append(event))
+    backend.load('song')
+    backend.play()
+    clock.advance(0.4)
+    assert backend.time == 400
+    clock.advance(1)
+    assert events == ['length', 'time', 'time', 'end']
@@ -0,0 +1,53 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import time
+
+from youtube_player.cache import StreamCache
+from youtube_player.formats import AudioFormat
+
+
+def formats(video_id):
+    return [AudioFormat(f'https://media.test/{video_id}/251', 135.2, 'opus')]
+
+
+def test_lookups_do_not_write(tmp_path):
+    cache = StreamCache(tmp_path / 'cache.sqlite')
+    cache.put('v0', formats('v0'), 'song 0')
+    changes = cache.connection.total_changes
+    for _ in range(10):
+        assert cache.get('v0')[1] == 'song 0'
+
+    assert cache.connection.total_changes == changes
+    cache.close()
+
+
+def test_least_recently_used_is_evicted_beyond_max_entries(tmp_path):
+    cache = StreamCache(tmp_path / 'cache.sqlite', max_entries=3)
+    for index in range(3):
+        cache.put(f'v{index}', formats(f'v{index}'), f'song {index}')
+        time.sleep(0.01)
+
+    assert cache.get('v0')
+    cache.put('v1', formats('v1'), 'song 1')
+    assert cache.entries == 3
+    cache.put('v3', formats('v3'), 'song 3')
+    assert cache.entries == 3
+    assert cache.get('v2') is None
+    assert cache.get('v0') and cache.get('v1') and cache.get('v3')
+    cache.close()
+
+    reopened = StreamCache(tmp_path / 'cache.sqlite', max_entries=3)
+    assert reopened.entries == 3
+    reopened.close()
+
+
+def test_a_full_cache_evicts_a_tenth_at_once(tmp_path):
+    cache = StreamCache(tmp_path / 'cache.sqlite', max_entries=20)
+    for index in range(21):
+        cache.put(f'v{index}', formats(f'v{index}'), f'song {index}')
+
+    assert cache.entries == 18
+    assert cache.get('v0') is None and cache.get('v20')
+    cache.close()
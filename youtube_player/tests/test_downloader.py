@@ -0,0 +1,95 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import shutil
+import threading
+import time
+import urllib.request
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+
+from youtube_player import downloader
+from youtube_player.downloader import DownloadManager
+from conftest import songs
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    ''' Serves some bytes of audio for /<video id> once the gate is open and
+        counts the requests of each video id
+    '''
+    gate = threading.Event()
+    requests = Counter()
+
+    def do_GET(self):
+        self.requests[self.path.strip('/')] += 1
+        self.gate.wait(5)
+        body = b'audio' * 100
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def media_server():
+    MediaHandler.gate.clear()
+    MediaHandler.requests.clear()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MediaHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    MediaHandler.gate.set()
+    server.shutdown()
+    server.server_close()
+
+
+def downloading_ydl(server):
+    class DownloadingYoutubeDL:
+        ''' Stand-in for yt_dlp.YoutubeDL that downloads the audio of a video
+            from the local media server into the home path of the options
+        '''
+        def __init__(self, options):
+            self.options = options
+
+        def extract_info(self, url, download=False):
+            video_id = url.rsplit('=', 1)[-1]
+            with urllib.request.urlopen(
+                    f'http://127.0.0.1:{server.server_port}/{video_id}') as response:
+                data = response.read()
+            path = Path(self.options['paths']['home']) / f'{video_id}.webm'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            for hook in self.options['progress_hooks']:
+                hook({'status': 'downloading', 'info_dict': {'id': video_id},
+                      'downloaded_bytes': len(data), 'total_bytes': len(data)})
+            return {'id': video_id, 'duration': 200,
+                    'requested_downloads': [{'filepath': str(path)}]}
+
+    return DownloadingYoutubeDL
+
+
+def test_songs_being_downloaded_are_not_downloaded_again(model, media_server, monkeypatch):
+    monkeypatch.setattr(
+        downloader, 'transcode', lambda source, target, title: shutil.copy(source, target))
+    model.downloaders.factory = downloading_ydl(media_server)
+    manager = DownloadManager(model, retry_delay=0)
+    first = manager.download_playlist(songs(2))
+    again = manager.download_playlist(songs(2) + songs(1))
+    assert again == first + first[:1]
+
+    MediaHandler.gate.set()
+    deadline = time.monotonic() + 5
+    while manager.progress() != (2, 2) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [job.status for job in manager.jobs] == ['done', 'done']
+    assert MediaHandler.requests == {'v0': 1, 'v1': 1}
+    assert model.local_media('https://www.youtube.com/watch?v=v1')
+    manager.shutdown()
@@ -0,0 +1,49 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import json
+
+import pytest
+
+from youtube_player.backend import NullBackend
+from youtube_player.model import ExtractorPool, YouTubePlayerModel
+
+
+def test_failed_extractor_gives_its_slot_back():
+    attempts = []
+
+    def factory(options):
+        attempts.append(options)
+        if len(attempts) == 1:
+            raise ImportError('No module named yt_dlp')
+        return object()
+
+    pool = ExtractorPool({}, size=1, factory=factory)
+    with pytest.raises(ImportError):
+        pool.acquire()
+
+    assert pool.created == 0
+    ydl = pool.acquire()
+    pool.release(ydl)
+    assert pool.acquire() is ydl
+
+
+def test_library_finds_songs_of_an_earlier_download_directory(tmp_path, model, clock):
+    earlier = tmp_path / 'earlier'
+    earlier.mkdir()
+    (earlier / 'song [abcdefghijk].opus').write_bytes(b'')
+    (earlier / 'old [lmnopqrstuv].m4a').write_bytes(b'')
+    (earlier / 'library.json').write_text(json.dumps({'lmnopqrstuv': {
+        'path': str(earlier / 'old [lmnopqrstuv].m4a'), 'codec': 'm4a',
+        'bitrate': 129.5, 'duration': 200}}))
+    model.set_download_dir(earlier)
+    model.set_download_dir(tmp_path / 'later')
+
+    restarted = YouTubePlayerModel(
+        cache_file=tmp_path / 'cache2.sqlite', download_dir=tmp_path / 'music',
+        library_file=tmp_path / 'library.json', backend=lambda: NullBackend(clock),
+        clock=clock)
+    assert restarted.local_media('https://www.youtube.com/watch?v=abcdefghijk')
+    assert restarted.library.lookup('lmnopqrstuv')['bitrate'] == 129.5
+    restarted.close()
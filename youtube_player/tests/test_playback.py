@@ -0,0 +1,245 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import time
+
+import pytest
+
+from youtube_player.controller import MAX_FAILED_SONGS
+from conftest import songs, settle
+
+
+def start_playlist(controller, count=3):
+    controller.querylist = songs(count)
+    controller.import_all_to_playlist()
+    controller.pl_play_next()
+    settle(controller)
+
+
+def test_song_is_resolved_off_thread_and_played(controller, model, view, fake_ydl):
+    start_playlist(controller)
+    assert controller.current_song.video_id == 'v0'
+    assert controller.playing
+    assert view.current_titles[0] == ('song 0', '135k opus')
+    assert model.player.url == 'https://media.test/v0/251?call=1'
+
+
+def test_ui_thread_does_not_wait_for_a_slow_extractor(controller, fake_ydl):
+    fake_ydl.delay = 0.2
+    controller.querylist = songs(3)
+    controller.import_all_to_playlist()
+    started = time.perf_counter()
+    controller.pl_play_next()
+    longest = time.perf_counter() - started
+    deadline = time.monotonic() + 5
+    while controller.busy and time.monotonic() < deadline:
+        started = time.perf_counter()
+        controller.dispatch_callbacks()
+        longest = max(longest, time.perf_counter() - started)
+        time.sleep(0.002)
+
+    assert controller.playing
+    assert longest < 0.005
+
+
+def test_next_song_is_prefetched_and_preloaded(controller, model, clock, fake_ydl):
+    start_playlist(controller)
+    assert fake_ydl.calls[-1].endswith('v1')
+    assert model.players.preloaded == 'https://media.test/v1/251?call=2'
+
+    clock.advance(200)
+    settle(controller)
+    assert controller.current_song.video_id == 'v1'
+    assert controller.prefetch_stats() == {'hits': 1, 'misses': 1}
+    assert model.players.switched_at == clock.now
+    assert len(fake_ydl.calls) == 3
+
+
+def test_prefetch_stats_count_only_playlist_advances(controller, clock):
+    start_playlist(controller)
+    clock.advance(200)
+    settle(controller)
+    controller.pl_play_prev()
+    settle(controller)
+    controller.querylist = songs(1, prefix='q')
+    controller.query_play()
+    settle(controller)
+    assert controller.current_song.video_id == 'q0'
+    assert controller.prefetch_stats() == {'hits': 1, 'misses': 1}
+
+
+def test_quality_level_caps_the_bitrate(controller, model):
+    controller.set_quality(0)
+    start_playlist(controller)
+    assert controller.quality_text == '50k opus'
+
+
+def test_stalls_downshift_the_stream(controller, model, clock):
+    start_playlist(controller)
+    clock.advance(30)
+    for _ in range(controller.max_stalls):
+        controller.player_event('buffering', 40.0)
+        controller.player_event('buffering', 100.0)
+
+    assert controller.quality_text == '130k mp4a'
+    assert controller.bitrate_cap == 129.5
+    assert model.time == 30000
+
+
+def test_error_fails_over_to_the_next_format(controller, model, clock):
+    start_playlist(controller)
+    clock.advance(42)
+    model.player.emit('error')
+    settle(controller)
+    assert controller.stream_format.url.startswith('https://media.test/v0/140')
+    assert model.time == 42000
+    clock.advance(1)
+    settle(controller)
+    stats = controller.failover_stats()
+    assert stats['failovers'] == 1 and stats['recoveries'] == 1
+
+
+def test_song_is_resolved_again_when_all_formats_fail(controller, model, clock, fake_ydl):
+    start_playlist(controller)
+    clock.advance(10)
+    for _ in range(5):
+        model.player.emit('error')
+        settle(controller)
+
+    assert controller.failover_stats()['refreshes'] == 1
+    assert controller.current_song.video_id == 'v0'
+    assert model.time == 10000
+    assert fake_ydl.calls.count('https://www.youtube.com/watch?v=v0') == 2
+
+
+def test_crossfade_runs_its_full_length(controller, model):
+    start_playlist(controller)
+    model.crossfade = 0.3
+    model.players.clock = time.monotonic
+    model.players.sleep = time.sleep
+    started = time.monotonic()
+    controller.pl_play_next()
+    assert model.players.fader is not None
+    assert controller.playing
+    model.players.fader.join()
+    assert time.monotonic() - started >= 0.3
+    assert model.player.volume == model.volume
+    assert model.players.standby.state == 'stopped'
+
+
+def test_crossfade_on_every_song_change(controller, model, clock, monkeypatch):
+    events = []
+    player_event = controller.player_event
+    monkeypatch.setattr(
+        controller, 'player_event',
+        lambda event, *args: (events.append(event), player_event(event, *args)))
+    model.crossfade = 0.1
+    model.players.clock = time.monotonic
+    model.players.sleep = time.sleep
+    start_playlist(controller, count=4)
+    for video_id in ('v1', 'v2', 'v3'):
+        clock.advance(179.5)
+        settle(controller)
+        for _ in range(20):
+            if controller.current_song.video_id == video_id:
+                break
+            clock.advance(0.05)
+            settle(controller)
+
+        assert controller.current_song.video_id == video_id
+        model.players.stop_fade()
+        settle(controller)
+
+    assert events.count('crossfade') == 3
+    assert 'end' not in events
+
+
+def test_shuffle_finds_the_only_short_song(controller):
+    playlist = songs(20, seconds=600)
+    playlist[7].seconds = 60
+    controller.querylist = playlist
+    controller.import_all_to_playlist()
+    controller.toggle_shuffle()
+    controller.toggle_short_song()
+    for seed in range(50):
+        controller.set_shuffle_seed(seed)
+        controller.playlist.move_to(0)
+        assert controller.pl_find_short()
+        assert controller.playlist.current.video_id == 'v7'
+        # long songs passed over are not in the shuffle history
+        assert controller.shuffle_order_ is None
+
+
+def test_autoplay_skips_a_song_that_can_not_be_resolved(controller, clock, fake_ydl):
+    fake_ydl.unavailable = {'v1'}
+    start_playlist(controller)
+    clock.advance(200)
+    settle(controller)
+    assert controller.current_song.video_id == 'v2'
+    assert controller.playing
+    assert 'v1' in controller.dead_songs
+
+
+def test_codec_setting_picks_streams_of_the_codec(controller):
+    assert controller.set_codec('mp4a') == 'mp4a'
+    start_playlist(controller)
+    assert controller.quality_text == '130k mp4a'
+    assert controller.status()['codec'] == 'mp4a'
+    with pytest.raises(ValueError):
+        controller.set_codec('flac')
+
+
+def test_end_of_the_song_crossfaded_from_is_dropped(controller, model):
+    start_playlist(controller)
+    generation = model.generation
+    controller.player_event('crossfade', None, generation)
+    assert controller.current_song.video_id == 'v1'
+    controller.player_event('end', None, generation)
+    settle(controller)
+    assert controller.current_song.video_id == 'v1'
+
+
+def test_failed_query_play_keeps_the_current_song(controller, fake_ydl):
+    start_playlist(controller)
+    fake_ydl.unavailable = {'q0'}
+    controller.querylist = songs(1, prefix='q')
+    controller.query_play()
+    settle(controller)
+    assert controller.current_song.video_id == 'v0'
+    assert 'q0' in controller.dead_songs
+
+
+def test_network_outage_does_not_mark_the_playlist_dead(controller, fake_ydl):
+    fake_ydl.offline = True
+    controller.querylist = songs(8)
+    controller.import_all_to_playlist()
+    controller.pl_play_next()
+    settle(controller)
+    assert controller.current_song is None
+    assert not controller.dead_songs
+    assert len(fake_ydl.calls) <= 2 * MAX_FAILED_SONGS
+
+    fake_ydl.offline = False
+    controller.pl_play_next()
+    settle(controller)
+    assert controller.playing
+
+
+def test_shuffled_short_songs_are_prefetched(controller, clock):
+    playlist = songs(20, seconds=600)
+    for index in (2, 5, 11, 13, 17):
+        playlist[index].seconds = 60
+    controller.querylist = playlist
+    controller.import_all_to_playlist()
+    controller.toggle_shuffle()
+    controller.toggle_short_song()
+    controller.set_shuffle_seed(3)
+    controller.pl_play_next()
+    settle(controller)
+    for _ in range(4):
+        clock.advance(200)
+        settle(controller)
+        assert controller.song_is_short(controller.current_song)
+
+    assert controller.prefetch_stats() == {'hits': 4, 'misses': 1}
@@ -0,0 +1,177 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import json
+import random
+
+from youtube_player.playlist import Playlist, PlaylistFile
+from youtube_player.song import Song
+from conftest import songs, settle
+
+
+def read_all(playlist_file, chunk_size=3):
+    playlist = Playlist()
+    for chunk in playlist_file.read(chunk_size):
+        playlist.extend(chunk)
+    playlist_file.loaded(playlist)
+    return playlist
+
+
+def test_positions_follow_removals_without_a_rebuild():
+    rng = random.Random(5)
+    playlist = Playlist(songs(300) + songs(100))
+    playlist.position('v0')
+    positions = playlist.positions_
+    for step in range(200):
+        if step % 4 == 0:
+            playlist.append(Song(f'v{rng.randrange(400)}', 'title', 200))
+        else:
+            playlist.remove(rng.randrange(len(playlist)))
+
+        for video_id in set(playlist.video_ids) | {'v1', 'v399'}:
+            expected = (playlist.video_ids.index(video_id)
+                        if video_id in playlist.video_ids else None)
+            assert playlist.position(video_id) == expected
+
+    assert playlist.positions_ is positions
+
+
+def test_cursor_wraps_around():
+    playlist = Playlist(songs(3))
+    playlist.prev()
+    assert playlist.current.video_id == 'v2'
+    playlist.next()
+    assert playlist.current.video_id == 'v0'
+    assert [song.video_id for song in playlist.upcoming()] == ['v0', 'v1', 'v2']
+
+
+def test_remove_keeps_cursor_on_the_same_song():
+    playlist = Playlist(songs(5))
+    playlist.move_to(3)
+    playlist.remove(1)
+    assert playlist.current.video_id == 'v3'
+    assert playlist.position('v4') == 3
+    assert 'v1' not in playlist
+
+
+def test_short_songs():
+    playlist = Playlist([Song('a', 'a', 400), Song('b', 'b', 100), Song('c', 'c', 500)])
+    playlist.move_to(2)
+    assert playlist.next_short() == 1
+    assert [song.video_id for song in playlist.upcoming(short_only=True)] == ['b']
+
+
+def test_dedupe_keeps_first_entries():
+    playlist = Playlist(songs(3) + songs(2))
+    playlist.move_to(4)
+    assert playlist.count('v1') == 2
+    assert playlist.dedupe() == 2
+    assert playlist.video_ids == ['v0', 'v1', 'v2']
+    assert playlist.count('v1') == 1
+
+
+def test_file_appends_and_removes(tmp_path):
+    playlist_file = PlaylistFile(tmp_path / 'list.jsonl')
+    playlist = Playlist(songs(4))
+    playlist_file.write(playlist)
+    playlist.remove(1)
+    playlist_file.remove(1, playlist)
+    added = songs(1, prefix='new')
+    playlist.extend(added)
+    playlist_file.append(added)
+    lines = (tmp_path / 'list.jsonl').read_text().splitlines()
+    assert json.loads(lines[4]) == {'remove': 1}
+    assert len(lines) == 6
+
+    reread = read_all(PlaylistFile(tmp_path / 'list.jsonl'))
+    assert reread.video_ids == ['v0', 'v2', 'v3', 'new0']
+    assert len((tmp_path / 'list.jsonl').read_text().splitlines()) == 4
+
+
+def test_file_is_compacted_after_the_first_chunk(tmp_path):
+    playlist_file = PlaylistFile(tmp_path / 'list.jsonl')
+    playlist = Playlist(songs(4))
+    playlist_file.write(playlist)
+    playlist.remove(0)
+    playlist_file.remove(0, playlist)
+
+    chunks = PlaylistFile(tmp_path / 'list.jsonl').read(chunk_size=3)
+    assert next(chunks) == []
+    assert len((tmp_path / 'list.jsonl').read_text().splitlines()) == 5
+    assert [song.video_id for song in next(chunks)] == ['v1', 'v2', 'v3']
+    assert len((tmp_path / 'list.jsonl').read_text().splitlines()) == 3
+
+
+def test_file_imports_json(tmp_path):
+    source = tmp_path / 'list.json'
+    source.write_text(json.dumps([song.to_dict() for song in songs(5)]))
+    playlist = read_all(PlaylistFile(source))
+    assert playlist.video_ids == [f'v{index}' for index in range(5)]
+    assert (tmp_path / 'list.jsonl').exists()
+
+
+def test_file_edits_while_loading_are_written_when_loaded(tmp_path):
+    PlaylistFile(tmp_path / 'list.jsonl').write(songs(7))
+    playlist_file = PlaylistFile(tmp_path / 'list.jsonl')
+    playlist = Playlist()
+    chunks = playlist_file.read(3)
+    playlist.extend(next(chunks))
+    added = songs(1, prefix='new')
+    playlist.extend(added)
+    playlist_file.append(added)
+    for chunk in chunks:
+        playlist.extend(chunk)
+    playlist_file.loaded(playlist)
+    assert len(read_all(PlaylistFile(tmp_path / 'list.jsonl'))) == 8
+
+
+def test_file_rewrite_while_loading_waits_for_the_whole_playlist(tmp_path):
+    PlaylistFile(tmp_path / 'list.jsonl').write(songs(7))
+    playlist_file = PlaylistFile(tmp_path / 'list.jsonl')
+    playlist = Playlist()
+    chunks = playlist_file.read(3)
+    playlist.extend(next(chunks))
+    playlist_file.write(playlist)
+    assert len((tmp_path / 'list.jsonl').read_text().splitlines()) == 7
+
+    for chunk in chunks:
+        playlist.extend(chunk)
+    playlist_file.loaded(playlist)
+    assert len(read_all(PlaylistFile(tmp_path / 'list.jsonl'))) == 7
+
+
+def test_save_while_loading_saves_the_whole_playlist(controller, model, tmp_path):
+    PlaylistFile(tmp_path / 'list.jsonl').write(songs(5001))
+    controller.open_playlist(tmp_path / 'list.jsonl')
+    assert model.playlist_loading
+    controller.save_playlist(tmp_path / 'copy.jsonl')
+    controller.save_playlist(tmp_path / 'copy.json')
+    settle(controller)
+    assert len((tmp_path / 'copy.jsonl').read_text().splitlines()) == 5001
+    assert len(json.loads((tmp_path / 'copy.json').read_text())) == 5001
+    assert model.playlist_file.filename == tmp_path / 'copy.jsonl'
+
+
+def test_dedupe_and_merge_while_loading_keep_the_whole_file(controller, model, tmp_path):
+    PlaylistFile(tmp_path / 'list.jsonl').write(songs(3000) + songs(2000))
+    controller.open_playlist(tmp_path / 'list.jsonl')
+    controller.set_duplicates('merge')
+    controller.querylist = [Song('v1', 'new title', 100)]
+    controller.import_all_to_playlist()
+    assert controller.dedupe_playlist() == 0
+    settle(controller)
+    assert len(model.playlist) == 3000
+    assert model.playlist[1].title == 'new title'
+    reread = read_all(PlaylistFile(tmp_path / 'list.jsonl'))
+    assert reread.video_ids == model.playlist.video_ids
+    assert reread[1].title == 'new title'
+
+
+def test_title_is_shown_when_an_imported_playlist_arrives(controller, view, tmp_path):
+    source = tmp_path / 'list.json'
+    source.write_text(json.dumps([song.to_dict() for song in songs(5)]))
+    controller.open_playlist(source)
+    settle(controller)
+    assert len(controller.playlist) == 5
+    assert view.pl_titles[-1] == 'song 0'
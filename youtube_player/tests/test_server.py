@@ -0,0 +1,38 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import json
+import asyncio
+
+import pytest
+
+from youtube_player.server import ControlServer, address_of
+
+
+def test_only_loopback_addresses_are_served():
+    assert address_of(':9000') == ('localhost', 9000)
+    assert address_of('127.0.0.1:9000') == ('127.0.0.1', 9000)
+    assert address_of('[::1]:9000') == ('::1', 9000)
+    assert address_of('/tmp/player.sock') is None
+    for address in ('0.0.0.0:9000', '192.168.1.2:9000', 'example.com:9000'):
+        with pytest.raises(ValueError):
+            address_of(address)
+
+
+def test_request_over_the_line_limit_is_answered(controller, tmp_path):
+    path = str(tmp_path / 'control.sock')
+
+    async def run():
+        server = ControlServer(controller, path)
+        await server.start()
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b'{"command": "' + b'x' * (128 * 1024) + b'"}\n')
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        assert await reader.readline() == b''
+        writer.close()
+        await server.close()
+        return reply
+
+    assert 'error' in asyncio.run(run())
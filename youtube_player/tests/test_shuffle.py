@@ -0,0 +1,58 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import random
+
+from youtube_player.playlist import Playlist
+from youtube_player.shuffle import ShuffleSet, ShuffleOrder
+from conftest import songs
+
+
+def test_shuffle_set():
+    items = ShuffleSet(range(5), rng=random.Random(1))
+    items.remove(2)
+    items.discard(7)
+    assert sorted(items) == [0, 1, 3, 4]
+    assert 2 not in items and 3 in items
+    assert items.choice() in items
+    items.clear()
+    assert not items
+
+
+def test_order_draws_every_song_once_per_round():
+    playlist = Playlist(songs(50))
+    order = ShuffleOrder(playlist, seed=3)
+    drawn = [order.next() for _ in range(50)]
+    assert sorted(drawn) == sorted(playlist.video_ids)
+    assert drawn != playlist.video_ids
+    assert order.next() in playlist.video_ids
+
+
+def test_order_is_reproducible_with_a_seed():
+    playlist = Playlist(songs(20))
+    first = ShuffleOrder(playlist, seed=7)
+    second = ShuffleOrder(playlist, seed=7)
+    assert [first.next() for _ in range(20)] == [second.next() for _ in range(20)]
+
+
+def test_order_goes_back_through_history():
+    order = ShuffleOrder(Playlist(songs(10)), seed=1)
+    drawn = [order.next() for _ in range(3)]
+    assert order.prev() == drawn[1]
+    assert order.prev() == drawn[0]
+    assert order.next() == drawn[1]
+
+
+def test_order_follows_added_and_removed_songs():
+    playlist = Playlist(songs(10))
+    order = ShuffleOrder(playlist, seed=5)
+    drawn = {order.next() for _ in range(3)}
+    playlist.append(songs(1, prefix='new')[0])
+    order.add('new0')
+    removed = next(video_id for video_id in playlist.video_ids if video_id not in drawn)
+    order.remove(removed)
+    playlist.remove(playlist.position(removed))
+    drawn.update(order.next() for _ in range(8))
+    assert removed not in drawn
+    assert drawn == set(playlist.video_ids)
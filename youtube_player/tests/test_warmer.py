@@ -0,0 +1,35 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import threading
+import time
+
+from conftest import songs, settle
+
+
+def warmer_threads():
+    return [thread for thread in threading.enumerate()
+            if thread.name.startswith('youtube_warmer')]
+
+
+def test_warming_an_empty_playlist_finishes(controller, view):
+    controller.warm_playlist()
+    assert controller.warmer is None
+    assert not controller.busy
+    assert view.warm_progress == (0, 0, 0)
+
+
+def test_warmer_marks_dead_songs_and_ends_its_threads(controller, view, fake_ydl):
+    fake_ydl.unavailable = {'v1'}
+    controller.querylist = songs(2)
+    controller.import_all_to_playlist()
+    controller.warm_playlist()
+    settle(controller)
+    assert controller.warmer is None
+    assert view.warm_progress == (2, 2, 1)
+    assert controller.dead_songs == {'v1'}
+    deadline = time.monotonic() + 1.0
+    while warmer_threads() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not warmer_threads()
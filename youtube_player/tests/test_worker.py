@@ -0,0 +1,89 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import threading
+
+from youtube_player.worker import Dispatcher, WorkerPool, Waker
+
+
+def test_dispatch_runs_callbacks_in_order():
+    dispatcher = Dispatcher()
+    calls = []
+    for value in range(3):
+        dispatcher.post(calls.append, value)
+
+    assert dispatcher.dispatch() == 3
+    assert calls == [0, 1, 2]
+    assert dispatcher.dispatch() == 0
+
+
+def test_post_wakes_up_the_loop():
+    dispatcher = Dispatcher()
+    wakeups = []
+    dispatcher.wakeup = lambda: wakeups.append(True)
+    dispatcher.post(print)
+    assert wakeups == [True]
+
+
+def test_worker_callback_runs_on_dispatch():
+    dispatcher = Dispatcher()
+    pool = WorkerPool(dispatcher)
+    release = threading.Event()
+    results = []
+    future = pool.submit(
+        lambda: release.wait() and threading.current_thread().name,
+        callback=lambda future: results.append(future.result()))
+
+    assert pool.busy
+    release.set()
+    future.result(timeout=1)
+    assert not results
+    while not dispatcher.dispatch():
+        pass
+
+    assert results[0].startswith('youtube_player')
+    assert not pool.busy
+    pool.shutdown()
+
+
+def test_waker_notifies_off_the_posting_thread():
+    notified = threading.Event()
+    threads = []
+
+    def notify():
+        threads.append(threading.current_thread())
+        notified.set()
+
+    waker = Waker(notify)
+    waker.start()
+    dispatcher = Dispatcher()
+    dispatcher.wakeup = waker.wake
+    dispatcher.post(print)
+    assert notified.wait(1)
+    assert threads == [waker.thread]
+    waker.stop()
+    waker.thread.join(1)
+    assert not waker.thread.is_alive()
+
+
+def test_waker_keeps_running_when_notify_fails():
+    failed = threading.Event()
+    notified = threading.Event()
+
+    def notify():
+        if not failed.is_set():
+            failed.set()
+            raise RuntimeError('main thread is not in main loop')
+        notified.set()
+
+    waker = Waker(notify)
+    waker.start()
+    waker.wake()
+    assert failed.wait(1)
+    waker.wake()
+    assert notified.wait(1)
+    assert waker.thread.is_alive()
+    waker.stop()
+    waker.thread.join(1)
+    assert not waker.thread.is_alive()
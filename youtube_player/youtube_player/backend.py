@@ -0,0 +1,233 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import threading
+
+PRELOAD_OPTION = 'start-paused'
+MAX_VOLUME = 100
+DEFAULT_LENGTH = 180000
+
+
+class VlcBackend:
+    ''' Playback backend on a libvlc media player. A backend plays one media at
+        a time: load, play, pause, stop, seek, time and length in ms, volume
+        and error, and attach to receive the events 'end', 'error',
+        'buffering' (percentage), 'length' and 'time' (ms). Events are called
+        on the libvlc event thread.
+        vlc is imported and the player made on the first load, so other
+        backends run without libvlc and the gui shows without waiting for it;
+        until then the backend is stopped at time 0
+    '''
+    instance = None
+    lock = threading.Lock()
+
+    def __init__(self):
+        self.vlc = None
+        self.player_ = None
+        self.events = None
+        self.volume_ = MAX_VOLUME
+        self.callbacks = []
+
+    @property
+    def player(self):
+        if self.player_ is None:
+            import vlc
+            self.vlc = vlc
+            with self.lock:
+                if VlcBackend.instance is None:
+                    VlcBackend.instance = vlc.Instance()
+
+            self.player_ = self.instance.media_player_new()
+            # the event manager holds the ctypes callback libvlc calls, it
+            # must live as long as the player
+            self.events = self.player_.event_manager()
+            self.player_.audio_set_volume(self.volume_)
+            for callback in self.callbacks:
+                self.attach_player(callback)
+
+        return self.player_
+
+    def load(self, url, paused=False, start=0):
+        ''' load url to play from start (ms); a paused media is opened and
+            buffered on play, but stays at its start until played again
+        '''
+        player = self.player
+        options = (PRELOAD_OPTION,) if paused else ()
+        if start:
+            options += (f'start-time={start / 1000:.3f}',)
+        media = self.instance.media_new(url, *options)
+        media.get_mrl()
+        player.set_media(media)
+
+    def play(self):
+        if self.player_:
+            self.player_.play()
+
+    def pause(self, pause):
+        if self.player_:
+            self.player_.set_pause(pause)
+
+    def stop(self):
+        if self.player_:
+            self.player_.stop()
+
+    def seek(self, time):
+        if self.player_:
+            self.player_.set_time(int(time))
+
+    @property
+    def time(self):
+        return self.player_.get_time() if self.player_ else 0
+
+    @property
+    def length(self):
+        return self.player_.get_length() if self.player_ else 0
+
+    @property
+    def volume(self):
+        return self.player_.audio_get_volume() if self.player_ else self.volume_
+
+    @volume.setter
+    def volume(self, val):
+        self.volume_ = int(val)
+        if self.player_:
+            self.player_.audio_set_volume(self.volume_)
+
+    @property
+    def error(self) -> bool:
+        return bool(self.player_) and self.player_.get_state() == self.vlc.State.Error
+
+    def attach(self, callback):
+        self.callbacks.append(callback)
+        if self.player_:
+            self.attach_player(callback)
+
+    def attach_player(self, callback):
+        vlc = self.vlc
+        events = self.events
+        events.event_attach(
+            vlc.EventType.MediaPlayerEndReached, lambda event: callback('end', None))
+        events.event_attach(
+            vlc.EventType.MediaPlayerEncounteredError, lambda event: callback('error', None))
+        events.event_attach(
+            vlc.EventType.MediaPlayerBuffering,
+            lambda event: callback('buffering', event.u.new_cache))
+        events.event_attach(
+            vlc.EventType.MediaPlayerLengthChanged,
+            lambda event: callback('length', event.u.new_length))
+        events.event_attach(
+            vlc.EventType.MediaPlayerTimeChanged,
+            lambda event: callback('time', event.u.new_time))
+
+
+class SimulatedClock:
+    ''' Clock of null backends, time (in seconds) only moves on advance or
+        sleep, which plays all null backends of the clock for that time
+    '''
+    def __init__(self):
+        self.now = 0.0
+        self.backends = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        self.now += seconds
+        for backend in self.backends:
+            backend.advance(int(seconds * 1000))
+
+
+class NullBackend:
+    ''' Headless backend that plays nothing: a playing media advances with the
+        simulated clock and ends after its length, which is taken from
+        lengths (a function of the url) or DEFAULT_LENGTH. Events are called
+        on the thread that advances the clock, so runs are deterministic
+    '''
+    def __init__(self, clock, lengths=None):
+        self.clock = clock
+        self.lengths = lengths
+        self.url = None
+        self.length_ = 0
+        self.time_ = 0
+        self.volume_ = MAX_VOLUME
+        self.state = 'stopped'
+        self.start_paused = False
+        self.callbacks = []
+        clock.backends.append(self)
+
+    def emit(self, event, value=None):
+        for callback in self.callbacks:
+            callback(event, value)
+
+    def load(self, url, paused=False, start=0):
+        self.url = url
+        self.time_ = int(start)
+        self.length_ = 0
+        self.state = 'stopped'
+        self.start_paused = paused
+
+    def play(self):
+        if self.url is None:
+            return
+
+        if self.length_ == 0:
+            self.length_ = self.lengths(self.url) if self.lengths else DEFAULT_LENGTH
+            self.emit('length', self.length_)
+
+        if self.state == 'ended':
+            self.time_ = 0
+
+        if self.start_paused:
+            self.start_paused = False
+            self.state = 'paused'
+
+        else:
+            self.state = 'playing'
+
+    def pause(self, pause):
+        if self.state in ('playing', 'paused'):
+            self.state = 'paused' if pause else 'playing'
+
+    def stop(self):
+        self.state = 'stopped'
+        self.time_ = 0
+
+    def seek(self, time):
+        self.time_ = min(max(int(time), 0), self.length_)
+
+    def advance(self, milliseconds):
+        if self.state != 'playing':
+            return
+
+        self.time_ = min(self.time_ + milliseconds, self.length_)
+        self.emit('time', self.time_)
+        if self.time_ >= self.length_:
+            self.state = 'ended'
+            self.emit('end')
+
+    @property
+    def time(self):
+        return self.time_
+
+    @property
+    def length(self):
+        return self.length_
+
+    @property
+    def volume(self):
+        return self.volume_
+
+    @volume.setter
+    def volume(self, val):
+        self.volume_ = int(val)
+
+    @property
+    def error(self) -> bool:
+        return False
+
+    def attach(self, callback):
+        self.callbacks.append(callback)
@@ -0,0 +1,175 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import re
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from youtube_player.formats import AudioFormat
+
+CACHE_FILE = Path.home() / '.youtube_player' / 'stream_cache.sqlite'
+MAX_CACHE_ENTRIES = 2000
+USED_FLUSH = 100
+DEFAULT_TTL = 3600
+EXPIRE_MARGIN = 300
+EXPIRE_PARAM = re.compile(r'[?&/]expire[=/](\d+)')
+MAX_SEARCH_ENTRIES = 100
+SEARCH_TTL = 1800
+
+
+def stream_expiry(audio_urls) -> float:
+    ''' epoch time at which the first of the audio urls expires, googlevideo
+        urls carry it as expire=<epoch> (or /expire/<epoch>/ for manifests)
+    '''
+    expires = [
+        int(match.group(1)) for url in audio_urls
+        if (match := EXPIRE_PARAM.search(url))
+    ]
+    if not expires:
+        return time.time() + DEFAULT_TTL
+
+    return min(expires) - EXPIRE_MARGIN
+
+
+def normalise_query(query: str) -> str:
+    return ' '.join(query.casefold().split())
+
+
+class SearchCache:
+    ''' In memory LRU cache of search results with a time to live, keyed by
+        the normalised query and the number of results asked for
+    '''
+    def __init__(self, max_entries=MAX_SEARCH_ENTRIES, ttl=SEARCH_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query, max_results=None):
+        with self.lock:
+            key = (normalise_query(query), max_results)
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.time():
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, query, results, max_results=None):
+        with self.lock:
+            key = (normalise_query(query), max_results)
+            self.entries[key] = (time.time() + self.ttl, results)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits, 'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class StreamCache:
+    ''' Persistent cache of resolved audio formats and title keyed by video id,
+        stored in sqlite. Entries expire with their urls and the least recently
+        used entries are evicted beyond max_entries; entries of bare urls, as
+        cached by earlier versions, are dropped. A lookup does not write: the
+        times of use are kept in memory and written in one go with the next
+        put, every USED_FLUSH lookups and on closing. Safe to use from the
+        worker threads
+    '''
+    def __init__(self, filename=CACHE_FILE, max_entries=MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.used = {}
+        if filename != ':memory:':
+            Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS streams ('
+            'video_id TEXT PRIMARY KEY, title TEXT, audio_urls TEXT, '
+            'expires REAL, last_used REAL)'
+        )
+        self.connection.commit()
+        self.entries = self.connection.execute('SELECT COUNT(*) FROM streams').fetchone()[0]
+
+    def get(self, video_id):
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT audio_urls, title, expires FROM streams WHERE video_id = ?',
+                (video_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            audio_formats, title, expires = row
+            audio_formats = json.loads(audio_formats)
+            if expires < time.time() or not all(isinstance(fmt, dict) for fmt in audio_formats):
+                self.delete(video_id)
+                self.connection.commit()
+                return None
+
+            self.used[video_id] = time.time()
+            if len(self.used) >= USED_FLUSH:
+                self.flush_used()
+                self.connection.commit()
+            return [AudioFormat.from_dict(fmt) for fmt in audio_formats], title
+
+    def put(self, video_id, audio_formats, title):
+        with self.lock:
+            new = self.connection.execute(
+                'SELECT 1 FROM streams WHERE video_id = ?', (video_id,)).fetchone() is None
+            self.used.pop(video_id, None)
+            self.connection.execute(
+                'INSERT OR REPLACE INTO streams VALUES (?, ?, ?, ?, ?)',
+                (video_id, title, json.dumps([fmt.to_dict() for fmt in audio_formats]),
+                 stream_expiry([fmt.url for fmt in audio_formats]), time.time())
+            )
+            self.entries += new
+            if self.entries > self.max_entries:
+                # a tenth is evicted at once, so a full cache does not run
+                # the eviction on every put
+                self.flush_used()
+                self.entries -= self.connection.execute(
+                    'DELETE FROM streams WHERE video_id NOT IN ('
+                    'SELECT video_id FROM streams ORDER BY last_used DESC LIMIT ?)',
+                    (self.max_entries - self.max_entries // 10,)
+                ).rowcount
+            self.connection.commit()
+
+    def flush_used(self):
+        # write the times of use kept since the last flush, under the lock
+        if self.used:
+            self.connection.executemany(
+                'UPDATE streams SET last_used = ? WHERE video_id = ?',
+                ((last_used, video_id) for video_id, last_used in self.used.items()))
+            self.used = {}
+
+    def delete(self, video_id):
+        self.used.pop(video_id, None)
+        self.entries -= self.connection.execute(
+            'DELETE FROM streams WHERE video_id = ?', (video_id,)).rowcount
+
+    def invalidate(self, video_id):
+        with self.lock:
+            self.delete(video_id)
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.flush_used()
+            self.connection.commit()
+            self.connection.close()
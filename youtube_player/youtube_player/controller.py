@@ -2,9 +2,21 @@
 Gui YouTube player: based on question
 https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
 '''
+import time
 import random
+import itertools
 from collections import deque
-from youtube_player.model import song_is_short
+from concurrent.futures import Future
+from youtube_player.model import song_is_short, is_unavailable, MAX_SEARCH_RESULTS
+from youtube_player.worker import Dispatcher, WorkerPool
+from youtube_player.formats import select_format, quality_bitrate, PREFERRED_CODECS
+from youtube_player.playlist import DUPLICATE_POLICIES
+from youtube_player.downloader import DownloadManager
+from youtube_player.warmer import PlaylistWarmer
+from youtube_player.shuffle import ShuffleSet, ShuffleOrder
+
+SEARCH_WORKERS = 2
+MAX_FAILED_SONGS = 5
 
 
 class Controller:
@@ -14,32 +26,177 @@ class Controller:
     def __init__(self, model, view):
         self.model = model
         self.view = view
-        self.playlist = deque([])
-        self.querylist = deque([])
-        self.playlist_rotations = 0
-        self.pl_not_played_set = set()
+        self.querylist = []
+        self.query_index = 0
+        self.query_text = None
+        self.query_generation = 0
+        self.query_future = None
+        self.pl_not_played_set = ShuffleSet()
+        self.shuffle_order_ = None
+        self.short_order_ = None
         self.current_song = None
+        self.quality_text = None
+        self.stream_format = None
+        self.bitrate_cap = None
+        self.codec = None
+        self.stalls = deque()
+        self.failed_at = None
+        self.failed_urls = set()
+        self.resume_time = 0
+        self.failovers = 0
+        self.stream_refreshes = 0
+        self.recovery_times = []
         self.prev_song = None
+        self.pending_song = None
+        self.playlist_song = None
+        self.failed_songs = 0
+        self.stream_refreshed = False
+        self.prefetched = {}
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        self.dispatcher = Dispatcher()
+        self.workers = WorkerPool(self.dispatcher)
+        self.searches = WorkerPool(self.dispatcher, max_workers=SEARCH_WORKERS)
+        self.downloads = None
+        self.warmer = None
+        self.warm_updated = False
+        self.dead_songs = set()
+        self.duplicates = 'skip'
+        self.buffering = 100.0
+        self.model.attach_events(
+            lambda *event: self.dispatcher.post(self.player_event, *event))
         self.pause = False
         self.skip_time = 10000
+        self.search_results = MAX_SEARCH_RESULTS
+        self.prefetch_time = 20
+        self.stall_window = 60
+        self.max_stalls = 3
+
+    @property
+    def playlist(self):
+        return self.model.playlist
 
     def set_initial_values(self):
         self.quality_level = 1
         self.shuffle = False
         self.model.short_song = False
         self.autoplay = True
+        self.lookahead = 1
+        self.shuffle_seed = None
         volume = 60
         return self.quality_level, self.shuffle, self.model.short_song, self.autoplay, volume
 
     def open_playlist(self, filename):
-        self.model.open_playlist(filename)
-        self.playlist = deque(self.model.playlist)
-        self.pl_not_played_set = {v['url'] for v in self.playlist}
-        self.view.pl_show_title(self.playlist[0]['title'])
+        # the first songs are shown right away, the rest of the playlist is
+        # read on a worker thread and added as it arrives
+        chunks = self.model.open_playlist(filename)
+        self.pl_not_played_set = ShuffleSet()
+        self.shuffle_order_ = None
+        self.short_order_ = None
+        self.playlist_chunk(self.playlist, next(chunks, []))
+        self.pl_show_title()
+        self.workers.submit(
+            self.fetch_playlist, self.playlist, chunks, callback=self.playlist_loaded)
+
+    def fetch_playlist(self, playlist, chunks):
+        try:
+            for songs in chunks:
+                self.dispatcher.post(self.playlist_chunk, playlist, songs)
+
+        finally:
+            self.dispatcher.post(self.playlist_chunk, playlist, None)
+
+    def playlist_chunk(self, playlist, songs):
+        # ignore songs of a playlist that has been replaced in the meantime,
+        # None marks the end of the playlist
+        if playlist is not self.playlist:
+            return
+
+        if songs is None:
+            # a dedupe asked for while loading removes songs now
+            if self.model.playlist_loaded():
+                self.shuffle_order_ = None
+                self.pl_show_title()
+            return
+
+        # the first chunk can be empty while the file is compacted, the title
+        # is shown with the first songs
+        show_title = not self.playlist and songs
+        self.model.load_songs(songs)
+        self.pl_not_played_set.update(song.video_id for song in songs)
+        if self.shuffle_order_:
+            for song in songs:
+                self.shuffle_order_.add(song.video_id)
+        if show_title:
+            self.pl_show_title()
+
+    def playlist_loaded(self, future):
+        if future.exception():
+            print(f'loading playlist failed: {future.exception()}')
 
     def save_playlist(self, filename):
         self.model.save_playlist(filename)
 
+    def download_playlist(self, directory=None):
+        if directory:
+            self.model.set_download_dir(directory)
+
+        if self.downloads is None:
+            self.downloads = DownloadManager(
+                self.model,
+                on_progress=lambda job: self.dispatcher.post(self.download_progress, job))
+
+        self.downloads.download_playlist(list(self.model.playlist))
+        self.download_progress(None)
+
+    def warm_playlist(self):
+        ''' resolve all songs of the playlist in the background, so they
+            start without waiting for yt-dlp; titles and durations are
+            updated and songs that can not be played are skipped by autoplay
+        '''
+        if self.warmer:
+            self.warmer.cancel()
+
+        warmer = PlaylistWarmer(
+            self.model,
+            on_song=lambda *args: self.dispatcher.post(self.song_warmed, warmer, *args))
+        self.warmer = warmer
+        self.warm_updated = False
+        warmer.warm(list(self.playlist))
+        self.view.show_warm_progress(*warmer.progress())
+        # an empty playlist is warm straight away, no song is reported
+        if warmer.finished:
+            self.warmer = None
+
+    def song_warmed(self, warmer, index, song, resolved, error):
+        # ignore songs of a warm up that has been replaced
+        if warmer is not self.warmer:
+            return
+
+        if error is not None:
+            print(f'{song.title} can not be played: {error}')
+            if is_unavailable(error):
+                self.dead_songs.add(song.video_id)
+
+        else:
+            self.dead_songs.discard(song.video_id)
+            if resolved is not song and self.model.update_song(resolved, index):
+                self.warm_updated = True
+
+        self.view.show_warm_progress(*warmer.progress())
+        if warmer.finished:
+            self.warmer = None
+            if self.warm_updated:
+                self.model.playlist_updated()
+                self.pl_show_title()
+
+    def download_progress(self, job):
+        if job and job.status == 'failed':
+            print(f'download of {job.song.title} failed: {job.error}')
+
+        done, total = self.downloads.progress()
+        self.view.show_download_progress(done, total)
+
     def set_quality(self, val):
         match val:
             case 'max':
@@ -54,8 +211,28 @@ class Controller:
             case _:
                 self.quality_level = 1
 
+        self.bitrate_cap = None
         return self.quality_level
 
+    def set_codec(self, codec):
+        ''' codec of the streams played when a song has it, one of
+            PREFERRED_CODECS, or None for the best stream of any codec
+        '''
+        if codec and codec not in PREFERRED_CODECS:
+            raise ValueError(f'codec must be one of {PREFERRED_CODECS}: {codec}')
+
+        self.codec = codec if codec else None
+        return self.codec
+
+    def set_lookahead(self, depth):
+        self.lookahead = max(0, int(depth))
+        self.prefetch()
+        return self.lookahead
+
+    def set_crossfade(self, seconds):
+        self.model.crossfade = seconds
+        return self.model.crossfade
+
     def toggle_autoplay(self):
         self.autoplay = not self.autoplay
         return self.autoplay
@@ -64,53 +241,138 @@ class Controller:
         self.model.short_song = not self.model.short_song
         return self.model.short_song
 
+    def set_short_song_length(self, seconds):
+        self.model.short_song_length = seconds
+
     def toggle_shuffle(self):
         self.shuffle = not self.shuffle
+        self.shuffle_order_ = None
+        self.short_order_ = None
         return self.shuffle
 
+    def set_shuffle_seed(self, seed):
+        self.shuffle_seed = seed
+        self.shuffle_order_ = None
+        self.short_order_ = None
+
+    @property
+    def shuffle_order(self):
+        # a new shuffle order is drawn lazily after shuffle is switched on
+        # or the playlist is replaced
+        if self.shuffle_order_ is None:
+            self.shuffle_order_ = ShuffleOrder(self.model.playlist, self.shuffle_seed)
+        return self.shuffle_order_
+
     def import_all_to_playlist(self):
         if self.querylist:
-            self.model.extend_playlist(self.querylist)
-            self.playlist = deque(self.model.playlist)
-            self.pl_not_played_set |= {v['url'] for v in self.querylist}
-            self.playlist_rotations += len(self.querylist) if self.playlist_rotations > 0 else 0
-            self.playlist.rotate(+self.playlist_rotations)
+            songs = self.model.extend_playlist(self.querylist, self.duplicates)
+            self.pl_not_played_set.update(song.video_id for song in songs)
+            if self.shuffle_order_:
+                for song in songs:
+                    self.shuffle_order_.add(song.video_id)
             self.pl_show_title()
 
+    def set_duplicates(self, policy):
+        ''' how songs already in the playlist are added: 'skip', 'allow' or
+            'merge'
+        '''
+        if policy not in DUPLICATE_POLICIES:
+            raise ValueError(f'duplicates must be one of {DUPLICATE_POLICIES}: {policy}')
+
+        self.duplicates = policy
+        return self.duplicates
+
+    def dedupe_playlist(self):
+        # the shuffle order has slots for the removed songs, it is drawn anew
+        removed = self.model.dedupe_playlist()
+        if removed:
+            self.shuffle_order_ = None
+            self.pl_show_title()
+        return removed
+
     def clear_playlist(self):
         self.model.clear_playlist()
-        self.playlist = deque(self.model.playlist)
-        self.pl_not_played_set = set()
-        self.playlist_rotations = 0
+        self.pl_not_played_set = ShuffleSet()
+        self.shuffle_order_ = None
+        self.short_order_ = None
         self.view.pl_show_title('')
 
     def query_songs(self, query_text):
-        self.querylist = deque(self.model.search(query_text))
-        return self.querylist[0]['title'] if self.querylist else None
+        ''' search on a worker thread of its own; pages of results are
+            appended to the querylist as they arrive, so browsing can start
+            with the first page. Each query takes the next generation: a
+            query that has not started is cancelled by a newer one, one that
+            is running stops at its next page and its results are dropped
+        '''
+        if (query_text == self.query_text and self.query_future
+                and not self.query_future.done()):
+            return
+
+        if self.query_future:
+            self.query_future.cancel()
+
+        self.query_generation += 1
+        self.query_text = query_text
+        self.querylist = []
+        self.query_index = 0
+        generation = self.query_generation
+        self.query_future = self.searches.submit(
+            self.fetch_query, query_text, generation,
+            callback=lambda future: self.query_done(generation, future))
+
+    def fetch_query(self, query_text, generation):
+        # the scrape itself can not be interrupted, a superseded query is
+        # abandoned before and after it
+        if generation != self.query_generation:
+            return
+
+        for page in self.model.search_pages(query_text, max_results=self.search_results):
+            if generation != self.query_generation:
+                return
+
+            self.dispatcher.post(self.query_page, generation, page)
+
+    def query_page(self, generation, page):
+        # ignore pages of a query that has been replaced by a new query
+        if generation != self.query_generation:
+            return
+
+        show_title = not self.querylist
+        self.querylist.extend(page)
+        if show_title:
+            self.view.query_show_title(self.querylist[0].title)
+
+    def query_done(self, generation, future):
+        if generation != self.query_generation:
+            return
+
+        self.query_future = None
+        if not future.cancelled() and future.exception():
+            print(f'search failed: {future.exception()}')
 
     def query_prev(self):
         if self.querylist:
-            # shift right (+1) moves the previous element into position
-            self.querylist.rotate(+1)
-            return self.querylist[0]['title']
+            self.query_index = (self.query_index - 1) % len(self.querylist)
+            return self.querylist[self.query_index].title
 
     def query_next(self):
         if self.querylist:
-            # shift left (-1) moves the next element into position
-            self.querylist.rotate(-1)
-            return self.querylist[0]['title']
+            self.query_index = (self.query_index + 1) % len(self.querylist)
+            return self.querylist[self.query_index].title
 
     def query_play(self):
         if self.querylist:
-            self.play_song(self.querylist[0])
+            self.play_song(self.querylist[self.query_index])
 
     def query_add_song(self):
         if self.querylist:
-            self.model.add_to_playlist(self.querylist[0])
-            self.playlist = deque(self.model.playlist)
-            self.pl_not_played_set.add(self.querylist[0]['url'])
-            self.playlist_rotations += 1 if self.playlist_rotations > 0 else 0
-            self.playlist.rotate(+self.playlist_rotations)
+            song = self.querylist[self.query_index]
+            if not self.model.add_to_playlist(song, self.duplicates):
+                return
+
+            self.pl_not_played_set.add(song.video_id)
+            if self.shuffle_order_:
+                self.shuffle_order_.add(song.video_id)
             self.pl_show_title()
 
     def pl_play_prev(self):
@@ -123,23 +385,76 @@ class Controller:
         title = None
         quality_text = None
         if self.playlist:
-            # find a next short song, if any
-            count = 0
-            while (self.model.short_song
-                and not song_is_short(self.playlist[0]['duration'])):
-                self.pl_next()
-                count += 1
-                if count > len(self.playlist):
+            # find a next short song, if any, that can be played
+            for _ in range(len(self.playlist)):
+                if self.model.short_song and not self.pl_find_short():
                     if self.autoplay: self.view.toggle_autoplay()
                     return
 
+                if self.playlist.current.video_id not in self.dead_songs:
+                    break
+
+                self.pl_next()
+
+            else:
+                print('no song in the playlist can be played')
+                return
+
+            # move on before playing, a song that starts straight away
+            # prefetches the songs after it
             self.prev_song = self.current_song
-            self.play_song(self.playlist[0])
-            if (url := self.playlist[0]['url']) in self.pl_not_played_set:
-                self.pl_not_played_set.remove(url)
+            song = self.playlist.current
+            if song.video_id in self.pl_not_played_set:
+                self.pl_not_played_set.remove(song.video_id)
             self.pl_next()
+            self.playlist_song = song
+            self.play_song(song, advance=True)
             print(f'remaining song not yet played: {len(self.pl_not_played_set)}')
 
+    def pl_find_short(self):
+        ''' move to the next short song; in order through the index of short
+            songs, in shuffle mode by drawing from the short songs not drawn
+            this round, unless the song under the cursor, which is the one
+            prefetched, is short
+        '''
+        if self.playlist.next_short() is None:
+            return False
+
+        if not self.shuffle:
+            self.playlist.move_to(self.playlist.next_short())
+            self.pl_show_title()
+            return True
+
+        if self.song_is_short(self.playlist.current) or self.pl_draw_short():
+            self.pl_show_title()
+            return True
+
+        return False
+
+    def pl_draw_short(self):
+        # the round is taken from the index of short songs when it runs out;
+        # songs removed or no longer short since are dropped as drawn
+        for _ in range(2):
+            if not self.short_order_:
+                rng = (self.short_order_.rng if self.short_order_ is not None
+                       else random.Random(self.shuffle_seed))
+                self.short_order_ = ShuffleSet(
+                    (self.playlist.video_ids[position]
+                     for position in self.playlist.short_positions), rng=rng)
+
+            while self.short_order_:
+                video_id = self.short_order_.choice()
+                self.short_order_.discard(video_id)
+                position = self.playlist.position(video_id)
+                if position is not None and self.song_is_short(self.playlist[position]):
+                    self.playlist.move_to(position)
+                    return True
+
+        return False
+
+    def song_is_short(self, song):
+        return song_is_short(song.seconds, self.model.short_song_length)
+
     def pl_play_or_pause(self):
         self.pause = not self.pause
         self.model.pause(self.pause)
@@ -156,49 +471,58 @@ class Controller:
 
     def pl_prev(self):
         if self.playlist:
-            # shift right (+1) moves the previous element into position
             if not self.shuffle:
-                self.playlist_rotate(+1)
-                self.pl_show_title()
+                self.playlist.prev()
 
-            else:
-                self.pl_next()
+            elif video_id := self.shuffle_order.prev():
+                self.pl_move_to(video_id)
+
+            self.pl_show_title()
 
     def pl_next(self):
         if self.playlist:
             if not self.pl_not_played_set:
-                self.pl_not_played_set = {v['url'] for v in self.playlist}
+                self.pl_not_played_set = ShuffleSet(self.playlist.video_ids)
 
-            # shift left (-1) moves the next element into position
             if not self.shuffle:
-                self.playlist_rotate(-1)
+                self.playlist.next()
 
-            else:
-                url = random.choice(list(self.pl_not_played_set))
-                index = next((i for i, v in enumerate(self.playlist) if v['url'] == url), 0)
-                self.playlist_rotate(-index)
+            # in short song mode the next song is drawn from the short songs,
+            # so the song prefetched is the one played
+            elif self.model.short_song and self.playlist.next_short() is not None:
+                self.pl_draw_short()
+
+            elif video_id := self.shuffle_order.next():
+                self.pl_move_to(video_id)
 
         self.pl_show_title()
 
+    def pl_move_to(self, video_id):
+        if (position := self.playlist.position(video_id)) is not None:
+            self.playlist.move_to(position)
+
     def pl_remove_song(self):
         if self.playlist:
-            if (url := self.playlist[0]['url']) in self.pl_not_played_set:
-                self.pl_not_played_set.remove(url)
-            index = (
-                len(self.playlist) - self.playlist_rotations
-                if self.playlist_rotations > 0 else 0
-            )
-            self.model.remove_from_playlist(index)
-            self.playlist = deque(self.model.playlist)
-            self.playlist_rotations -= 1 if self.playlist_rotations > 0 else 0
-            self.playlist.rotate(self.playlist_rotations)
-            self.pl_prev()
-            self.pl_next()
+            # a song that is in the playlist more than once stays in the
+            # sets of video ids until its last entry is removed
+            video_id = self.playlist.current.video_id
+            last = self.playlist.count(video_id) == 1
+            if last and video_id in self.pl_not_played_set:
+                self.pl_not_played_set.remove(video_id)
+            # the shuffle order reads the playlist, update it before removal
+            if self.shuffle_order_:
+                self.shuffle_order_.remove(video_id, last)
+            self.model.remove_from_playlist(self.playlist.cursor)
+            if self.shuffle:
+                self.pl_next()
+
+            else:
+                self.pl_show_title()
 
     def pl_show_title(self):
         title = None
         if self.playlist:
-            title = self.playlist[0]['title']
+            title = self.playlist.current.title
         self.view.pl_show_title(title)
 
     def set_song_time(self, time_):
@@ -207,56 +531,394 @@ class Controller:
     def set_volume(self, volume):
         self.model.volume = volume
 
-    def select_stream(self, song_url):
-        if song_url:
-            audio_urls, _ = self.model.get_audio_urls(song_url)
-            if not audio_urls:
-                return None
+    def select_stream(self, formats):
+        if not formats:
+            return None
+
+        self.stream_format = self.stream_quality(formats)
+        self.stream = self.stream_format.url
+        return str(self.stream_format)
+
+    def max_bitrate(self):
+        # the bitrate of the quality level, lowered by a downshift
+        bitrate = quality_bitrate(self.quality_level)
+        if self.bitrate_cap is not None:
+            return self.bitrate_cap if bitrate is None else min(bitrate, self.bitrate_cap)
+
+        return bitrate
+
+    def stream_quality(self, formats):
+        return select_format(formats, self.max_bitrate(), self.codec)
+
+    def resolve(self, url, refresh=False):
+        ''' future with the audio urls and title of url; taken from the stream
+            cache if possible, otherwise resolved on a worker thread
+        '''
+        if not refresh and (cached := self.model.cached_audio_formats(url)):
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        return self.workers.submit(self.model.get_audio_formats, url, refresh)
+
+    def play_song(self, song, refresh=False, start=0, paused=False, advance=False):
+        # a failover in progress is abandoned when another song is played
+        if not refresh:
+            self.failed_at = None
+
+        # a downloaded song is played from the library
+        if not refresh and (mrl := self.model.local_media(song.url)):
+            self.pending_song = None
+            self.stream_format = None
+            self.start_song(song, mrl, 'local', paused=paused)
+            return
 
-            if (self.quality_level == 'max' or
-                    self.quality_level + 1 > len(audio_urls)):
-                self.stream = audio_urls[-1]
-                quality_text =  f'max ({len(audio_urls)})'
+        # resolve the audio urls on a worker thread, the song starts playing
+        # in stream_resolved once the result is dispatched on the gui thread;
+        # a song resolved by prefetch or in the cache starts straight away;
+        # only a playlist advance can be prefetched, so only those count in
+        # the prefetch stats
+        self.pending_song = song
+        self.stream_refreshed = refresh
+        future = self.prefetched.pop(song.url, None)
+        if (refresh or future is None or future.cancelled()
+                or (future.done() and future.exception())):
+            self.prefetch_misses += advance
+            future = self.resolve(song.url, refresh)
+
+        else:
+            self.prefetch_hits += advance
+
+        if future.done():
+            self.stream_resolved(song, future, start, paused)
+
+        else:
+            self.workers.add_callback(
+                future, lambda future: self.stream_resolved(song, future, start, paused))
+
+    def lookahead_songs(self):
+        ''' the next songs to be played from the playlist; in shuffle mode only
+            the next song is known
+        '''
+        if self.shuffle:
+            songs = itertools.islice(self.playlist.upcoming(), 1)
+            songs = (
+                song for song in songs
+                if not self.model.short_song or self.song_is_short(song)
+            )
+
+        else:
+            songs = self.playlist.upcoming(short_only=self.model.short_song)
+        songs = (song for song in songs if song.video_id not in self.dead_songs)
+        return list(itertools.islice(songs, self.lookahead))
+
+    def prefetch(self):
+        ''' resolve the audio urls of the next songs in the background, so
+            that the next song starts without waiting for yt-dlp
+        '''
+        urls = [
+            song.url for song in self.lookahead_songs()
+            if not self.model.local_media(song.url)
+        ]
+        for url in list(self.prefetched):
+            if url not in urls:
+                self.prefetched.pop(url).cancel()
+
+        for url in urls:
+            if url not in self.prefetched:
+                self.prefetched[url] = self.resolve(url)
+
+        self.preload()
+
+    def preload(self):
+        ''' open the next song on the standby player of the model once its
+            stream is known, so it starts without buffering
+        '''
+        if not (songs := self.lookahead_songs()):
+            return
+
+        song = songs[0]
+        if mrl := self.model.local_media(song.url):
+            self.model.preload(mrl)
+
+        elif (future := self.prefetched.get(song.url)) is not None:
+            if future.done():
+                self.stream_preloaded(song, future)
 
             else:
-                self.stream = audio_urls[self.quality_level]
-                quality_text = f'{self.quality_level}'
-            return quality_text
+                self.workers.add_callback(
+                    future, lambda future: self.stream_preloaded(song, future))
+
+    def stream_preloaded(self, song, future):
+        # ignore the result if the next song changed in the meantime
+        if (self.prefetched.get(song.url) is not future or future.cancelled()
+                or future.exception()):
+            return
+
+        if formats := future.result()[0]:
+            self.model.preload(self.stream_quality(formats).url)
+
+    def prefetch_stats(self):
+        return {'hits': self.prefetch_hits, 'misses': self.prefetch_misses}
+
+    def failover_stats(self):
+        ''' failovers to another format of the same resolution, re-resolved
+            streams and the seconds from a stream error until the song played
+            again
+        '''
+        recoveries = len(self.recovery_times)
+        return {
+            'failovers': self.failovers,
+            'refreshes': self.stream_refreshes,
+            'recoveries': recoveries,
+            'last_recovery': self.recovery_times[-1] if recoveries else None,
+            'mean_recovery': sum(self.recovery_times) / recoveries if recoveries else None,
+            'max_recovery': max(self.recovery_times) if recoveries else None,
+        }
+
+    def stream_resolved(self, song, future, start=0, paused=False):
+        # ignore the result if another song was requested in the meantime
+        if song is not self.pending_song:
+            return
 
-    def play_song(self, song_dict):
-        quality_text = self.select_stream(song_dict['url'])
+        self.pending_song = None
+        try:
+            formats, _ = future.result()
+
+        except Exception as error:
+            print(f'unable to get audio for {song.title}: {error}')
+            self.failover_failed(song, error)
+            return
+
+        if self.failed_at is not None:
+            formats = [fmt for fmt in formats if fmt.url not in self.failed_urls]
+
+        quality_text = self.select_stream(formats)
         if quality_text is None:
+            self.failover_failed(song)
             return
 
-        self.model.get_player(self.stream)
-        self.model.play()
-        self.current_song = song_dict
-        self.pause = True
-        self.pl_play_or_pause()
-        self.view.pl_show_current_title(song_dict['title'], quality_text)
+        self.start_song(song, self.stream, quality_text, start, paused)
+
+    def start_song(self, song, stream, quality_text, start=0, paused=False):
+        self.stream = stream
+        self.current_song = song
+        self.quality_text = quality_text
+        # a switch to the preloaded song plays already, playing it again
+        # would cut its crossfade short
+        if self.model.get_player(self.stream, start=start) and not paused:
+            self.pause = False
+
+        else:
+            self.model.play()
+            self.pause = not paused
+            self.pl_play_or_pause()
+        self.view.pl_show_current_title(song.title, quality_text)
+        self.prefetch()
 
     def update_song_status(self):
         time = self.model.time * 0.001
         length = self.model.length * 0.001
 
-        # fetch the song again if completed; if autoplay then play next song
-        if length > 0 and abs(time - length) < 1:
-            if self.autoplay:
-                self.pl_play_next()
-
-            else:
-                self.model.get_player(self.stream)
-                self.model.play()
-                self.pause = False
-                self.pl_play_or_pause()
+        # make sure the next song is prefetched as the end of the song nears,
+        # the playlist may have been browsed or edited since the song started
+        if self.autoplay and length > 0 and length - time < self.prefetch_time:
+            self.prefetch()
 
         return time, length
 
-    def playlist_rotate(self, val):
-        self.playlist.rotate(val)
-        self.playlist_rotations = (
-            (self.playlist_rotations + val) % len(self.playlist) if len(self.playlist) else 0
-        )
+    def status(self):
+        return {
+            'title': self.current_song.title if self.current_song else None,
+            'url': self.current_song.url if self.current_song else None,
+            'time': self.model.time * 0.001,
+            'length': self.model.length * 0.001,
+            'quality': self.quality_text,
+            'bitrate': self.stream_format.abr if self.stream_format else None,
+            'bitrate_cap': self.bitrate_cap,
+            'codec': self.codec,
+            'pause': self.pause,
+            'buffering': self.buffering,
+            'volume': self.model.volume,
+            'autoplay': self.autoplay,
+            'shuffle': self.shuffle,
+            'playlist_title': self.playlist.current.title if self.playlist else None,
+        }
+
+    @property
+    def playing(self) -> bool:
+        return self.current_song is not None and not self.pause
+
+    @property
+    def busy(self) -> bool:
+        return (self.pending_song is not None or self.workers.busy or self.searches.busy
+                or self.warmer is not None)
+
+    def player_event(self, event, value, generation=None):
+        # an event of a stream that has been replaced since it was posted,
+        # like the end of the song that has just been crossfaded, is dropped
+        if generation is not None and generation != self.model.generation:
+            return
+
+        match event:
+            case 'end':
+                self.song_ended()
+            case 'crossfade':
+                if self.autoplay:
+                    self.song_ended()
+            case 'error':
+                self.stream_error()
+            case 'playing':
+                self.stream_playing()
+            case 'buffering':
+                self.buffering_changed(value)
+
+    def buffering_changed(self, value):
+        # a drop of the buffer while playing is a stall; after max_stalls
+        # stalls within stall_window seconds the stream is downshifted
+        stalled = self.buffering >= 100 and value < 100 and self.model.time > 0
+        self.buffering = value
+        if not stalled or self.pending_song is not None:
+            return
+
+        now = time.monotonic()
+        self.stalls.append(now)
+        while now - self.stalls[0] > self.stall_window:
+            self.stalls.popleft()
+
+        if len(self.stalls) >= self.max_stalls:
+            self.stalls.clear()
+            self.downshift()
+
+    def downshift(self):
+        ''' continue the current song on the next lower bitrate; later songs
+            are kept at or below that bitrate until the quality is set
+        '''
+        if self.stream_format is None or self.current_song is None:
+            return
+
+        if not (cached := self.model.cached_audio_formats(self.current_song.url)):
+            return
+
+        lower = select_format(cached[0], self.stream_format.abr - 1, self.codec)
+        if lower is None or lower.abr >= self.stream_format.abr:
+            return
+
+        print(f'downshift from {self.stream_format} to {lower}')
+        self.bitrate_cap = lower.abr
+        self.switch_stream(lower)
+
+    def switch_stream(self, audio_format, start=None):
+        ''' continue the current song on another format where it is, or at
+            start (ms)
+        '''
+        if start is None:
+            start = self.model.time
+        self.stream_format = audio_format
+        self.stream = audio_format.url
+        self.quality_text = str(audio_format)
+        self.model.get_player(self.stream, start=max(start, 0))
+        self.model.play()
+        self.pause = True
+        self.pl_play_or_pause()
+        self.view.pl_show_current_title(self.current_song.title, self.quality_text)
+
+    def song_ended(self):
+        # fetch the song again if completed; if autoplay then play next song,
+        # unless the next song is already being resolved
+        if self.pending_song is not None:
+            return
+
+        if self.autoplay:
+            self.pl_play_next()
+
+        else:
+            # the stream of the song may have expired meanwhile, so it is
+            # taken from the cache or resolved again
+            self.play_song(self.current_song, paused=True)
+
+    def stream_error(self):
+        ''' the stream failed to open or broke off, a url that expired or is
+            refused: continue the song at its last known position on the next
+            audio format of the song, and when all formats failed resolve the
+            song again once
+        '''
+        if self.pending_song is not None or self.current_song is None:
+            return
+
+        song = self.current_song
+        if self.failed_at is None:
+            self.failed_at = time.monotonic()
+            self.failed_urls = set()
+            self.resume_time = max(self.model.position, 0)
+
+        if self.stream_format is None:
+            print(f'unable to play {song.title}')
+            self.failover_failed(song)
+            return
+
+        self.failed_urls.add(self.stream)
+        if cached := self.model.cached_audio_formats(song.url):
+            formats = [fmt for fmt in cached[0] if fmt.url not in self.failed_urls]
+            if audio_format := self.stream_quality(formats):
+                print(f'stream {self.stream_format} failed, continue on {audio_format}')
+                self.failovers += 1
+                self.switch_stream(audio_format, self.resume_time)
+                return
+
+        if self.stream_refreshed:
+            self.failover_failed(song)
+            return
+
+        print(f'streams of {song.title} failed, resolving again')
+        self.stream_refreshes += 1
+        self.model.invalidate_audio_formats(song.url)
+        self.play_song(song, refresh=True, start=self.resume_time)
+
+    def stream_playing(self):
+        self.failed_songs = 0
+        if self.failed_at is not None:
+            self.recovery_times.append(time.monotonic() - self.failed_at)
+            self.failed_at = None
+
+    def failover_failed(self, song, error=None):
+        ''' give up on the song; it is skipped from now on if its streams all
+            failed or it is gone from YouTube, not after an error that may
+            pass. With autoplay the playlist goes on after the current song,
+            a song of the playlist that could not be resolved, or when nothing
+            plays; it stops after MAX_FAILED_SONGS songs in a row failed
+        '''
+        failover = self.failed_at is not None
+        self.failed_at = None
+        if error is None or is_unavailable(error):
+            self.dead_songs.add(song.video_id)
+        if failover:
+            print(f'unable to recover {song.title}')
+
+        if not self.autoplay:
+            return
+
+        if not (song is self.current_song if failover
+                else song is self.playlist_song or self.current_song is None):
+            return
+
+        self.failed_songs += 1
+        if self.failed_songs >= MAX_FAILED_SONGS:
+            print(f'{self.failed_songs} songs in a row could not be played, autoplay stops')
+            self.failed_songs = 0
+            return
+
+        self.pl_play_next()
+
+    def dispatch_callbacks(self):
+        return self.dispatcher.dispatch()
 
     def quit(self):
+        self.workers.shutdown()
+        self.searches.shutdown()
+        if self.warmer:
+            self.warmer.cancel()
+        if self.downloads:
+            self.downloads.shutdown()
+        self.model.close()
         self.view.exit()
@@ -0,0 +1,128 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import signal
+import asyncio
+from youtube_player.controller import Controller
+from youtube_player.server import ControlServer
+
+DAEMON_POLL_TIME = 5.0
+
+
+class NullView:
+    ''' View without a window for running headless: keeps what a gui would
+        show as attributes and logs the song that plays
+    '''
+    progress_bar_resolution = 0.001
+
+    def __init__(self):
+        self.controller = None
+        self.title = None
+        self.current_title = None
+        self.quality = None
+        self.query_title = None
+        self.downloads = (0, 0)
+        self.warm = (0, 0, 0)
+        self.on_exit = None
+
+    def set_controller(self, controller):
+        self.controller = controller
+        *_, volume = self.controller.set_initial_values()
+        self.controller.set_volume(volume)
+
+    def pl_show_title(self, title):
+        self.title = title
+
+    def pl_show_current_title(self, title, quality):
+        self.current_title = title
+        self.quality = quality
+        print(f'playing: {title} ({quality})')
+
+    def query_show_title(self, title):
+        self.query_title = title
+
+    def show_download_progress(self, done, total):
+        self.downloads = (done, total)
+
+    def show_warm_progress(self, done, total, dead):
+        self.warm = (done, total, dead)
+
+    def toggle_autoplay(self):
+        if self.controller:
+            self.controller.toggle_autoplay()
+
+    def exit(self):
+        if self.on_exit:
+            self.on_exit()
+
+
+class Daemon:
+    ''' Runs the model and controller without Tk on an asyncio event loop.
+        Callbacks posted to the dispatcher wake the loop instead of being
+        polled, and the song status is only polled while a song plays, so an
+        idle daemon does not wake up at all. With a control address the
+        ControlServer runs on the same loop
+    '''
+    poll_time = DAEMON_POLL_TIME
+
+    def __init__(self, model, view=None, control=None):
+        self.view = view if view else NullView()
+        self.controller = Controller(model, self.view)
+        self.view.set_controller(self.controller)
+        self.server = ControlServer(self.controller, control) if control else None
+        self.loop = None
+        self.stopped = None
+        self.poll_handle = None
+
+    def call(self, method, *args):
+        ''' call a controller method on the loop, starting the status poll in
+            case a song started playing
+        '''
+        result = getattr(self.controller, method)(*args)
+        self.start_polling()
+        return result
+
+    def dispatch(self):
+        if self.controller.dispatch_callbacks():
+            self.start_polling()
+
+    def start_polling(self):
+        if self.poll_handle is None:
+            self.poll_handle = self.loop.call_soon(self.poll_song_status)
+
+    def poll_song_status(self):
+        # the end of a song is signalled by a player event, polling only
+        # keeps the next songs prefetched and stops when not playing
+        if not self.controller.playing:
+            self.poll_handle = None
+            return
+
+        self.controller.update_song_status()
+        self.poll_handle = self.loop.call_later(self.poll_time, self.poll_song_status)
+
+    async def run(self, *calls):
+        ''' run until quit (or SIGINT, SIGTERM), calls are (method, *args)
+            tuples of controller methods to start with
+        '''
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        self.view.on_exit = self.stopped.set
+        self.controller.dispatcher.wakeup = (
+            lambda: self.loop.call_soon_threadsafe(self.dispatch))
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.loop.add_signal_handler(signum, self.controller.quit)
+
+        if self.server:
+            await self.server.start()
+
+        try:
+            for method, *args in calls:
+                self.call(method, *args)
+
+            await self.stopped.wait()
+
+        finally:
+            self.controller.dispatcher.wakeup = None
+            if self.server:
+                await self.server.close()
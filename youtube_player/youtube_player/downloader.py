@@ -0,0 +1,149 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import os
+import re
+import time
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from youtube_player.model import MAX_DOWNLOADS
+
+MAX_TRANSCODES = 1
+MAX_RETRIES = 3
+RETRY_DELAY = 2.0
+AUDIO_CODEC = 'mp3'
+AUDIO_BITRATE = 192
+FILENAME_CHARS = re.compile(r'[\\/:*?"<>|]')
+
+
+def audio_filename(song) -> str:
+    title = FILENAME_CHARS.sub('_', song.title).strip() or 'song'
+    return f'{title} [{song.video_id}].{AUDIO_CODEC}'
+
+
+def transcode(source, target, title):
+    ''' transcode source to an audio file target with ffmpeg; the audio is
+        written to a temporary file first, so target is never left half written
+    '''
+    partial = f'{target}.part'
+    subprocess.run(
+        ['ffmpeg', '-y', '-loglevel', 'error', '-i', str(source), '-vn',
+         '-b:a', f'{AUDIO_BITRATE}k', '-metadata', f'title={title}', '-f', AUDIO_CODEC, partial],
+        check=True, stdin=subprocess.DEVNULL,
+    )
+    os.replace(partial, target)
+
+
+class DownloadJob:
+    ''' State of the download of a single song
+    '''
+    def __init__(self, song, filename, library):
+        self.song = song
+        self.filename = filename
+        self.library = library
+        self.status = 'queued'
+        self.progress = 0.0
+        self.attempts = 0
+        self.error = None
+        self.info = {}
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+
+class DownloadManager:
+    ''' Downloads songs to the download directory of the model with a bounded
+        pool of workers. Failed downloads are retried with exponential backoff,
+        partial downloads are resumed and the number of simultaneous ffmpeg
+        transcodes is capped. on_progress is called with the job from the worker
+        threads whenever the status or the whole percentage of a job changes.
+        Downloaded songs are added to the media library of the model. A song
+        that is being downloaded is not downloaded again
+    '''
+    def __init__(self, model, max_downloads=MAX_DOWNLOADS, max_transcodes=MAX_TRANSCODES,
+                 max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY, on_progress=None):
+        self.model = model
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.on_progress = on_progress
+        self.transcodes = threading.BoundedSemaphore(max_transcodes)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_downloads, thread_name_prefix='youtube_downloader')
+        self.jobs = []
+        self.active = {}
+
+    def download(self, song):
+        ''' job downloading song, the unfinished job of the song if there is
+            one
+        '''
+        if (job := self.active.get(song.video_id)) is not None and not job.finished:
+            return job
+
+        job = DownloadJob(
+            song, Path(self.model.download_dir) / audio_filename(song), self.model.library)
+        self.jobs.append(job)
+        self.active[song.video_id] = job
+        self.executor.submit(self.run, job)
+        return job
+
+    def download_playlist(self, playlist):
+        return [self.download(song) for song in playlist]
+
+    def progress(self):
+        ''' number of finished jobs and total number of jobs
+        '''
+        return sum(1 for job in self.jobs if job.finished), len(self.jobs)
+
+    def update(self, job, status=None, progress=None):
+        previous = (job.status, int(job.progress * 100))
+        job.status = status if status else job.status
+        job.progress = progress if progress is not None else job.progress
+        if self.on_progress and previous != (job.status, int(job.progress * 100)):
+            self.on_progress(job)
+
+    def download_hook(self, job, status):
+        total = status.get('total_bytes') or status.get('total_bytes_estimate')
+        if status['status'] == 'downloading' and total:
+            self.update(job, progress=status.get('downloaded_bytes', 0) / total)
+
+    def run(self, job):
+        if job.filename.exists():
+            if job.song.video_id not in job.library:
+                job.library.add(job.song.video_id, job.filename, AUDIO_CODEC)
+            self.update(job, 'done', 1.0)
+            return job
+
+        delay = self.retry_delay
+        while True:
+            job.attempts += 1
+            try:
+                self.update(job, 'downloading')
+                source, job.info = self.model.download(
+                    job.song.url, lambda status: self.download_hook(job, status))
+
+                self.update(job, 'transcoding')
+                with self.transcodes:
+                    transcode(source, job.filename, job.song.title)
+                os.remove(source)
+                job.library.add(
+                    job.song.video_id, job.filename, AUDIO_CODEC,
+                    AUDIO_BITRATE, job.info.get('duration'))
+                self.update(job, 'done', 1.0)
+                return job
+
+            except Exception as error:
+                job.error = error
+                if job.attempts >= self.max_retries:
+                    self.update(job, 'failed')
+                    return job
+
+                self.update(job, 'retrying')
+                time.sleep(delay)
+                delay *= 2
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
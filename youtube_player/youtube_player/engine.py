@@ -0,0 +1,142 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import time
+import threading
+from youtube_player.backend import VlcBackend, MAX_VOLUME
+
+CROSSFADE = 0.0
+FADE_STEP = 0.05
+
+
+class DualPlayer:
+    ''' Two players made by backend: the active player plays the current song
+        while the standby player opens and buffers the next song, paused at its
+        start. Loading the preloaded song switches players instead of loading
+        it again, so there is no gap; with crossfade the songs are faded over
+        crossfade seconds on a thread. With null backends and the simulated
+        clock and sleep the switch and fade timing can be checked without libvlc
+    '''
+    def __init__(self, backend=VlcBackend, crossfade=CROSSFADE, clock=time.monotonic,
+                 sleep=time.sleep):
+        self.players = [backend(), backend()]
+        self.active_index = 0
+        self.crossfade = crossfade
+        self.clock = clock
+        self.sleep = sleep
+        self.volume_ = MAX_VOLUME
+        self.preload_url = None
+        self.preloaded = None
+        self.fader = None
+        self.fade_stop = threading.Event()
+        self.lock = threading.Lock()
+        self.switched_at = None
+
+    @property
+    def active(self):
+        return self.players[self.active_index]
+
+    @property
+    def standby(self):
+        return self.players[1 - self.active_index]
+
+    def load(self, url, start=0):
+        ''' play url from start (ms) on the active player; switches to the
+            standby player if url has been preloaded and starts at the
+            beginning. Returns True on a switch
+        '''
+        self.stop_fade()
+        with self.lock:
+            if url is not None and url == self.preloaded and not start:
+                self.switch()
+                return True
+
+        self.active.load(url, start=start)
+        return False
+
+    def preload(self, url):
+        ''' open url on the standby player; during a fade the standby player
+            is still fading out, url is loaded once the fade has finished
+        '''
+        with self.lock:
+            if url == self.preload_url:
+                return
+
+            self.preload_url = url
+            if self.fader is None:
+                self.load_standby()
+
+    def load_standby(self):
+        self.preloaded = self.preload_url
+        self.standby.stop()
+        if self.preloaded is None:
+            return
+
+        self.standby.volume = 0
+        self.standby.load(self.preloaded, paused=True)
+        self.standby.play()
+
+    def switch(self):
+        fade_out = self.active
+        self.active_index = 1 - self.active_index
+        self.preload_url = None
+        self.preloaded = None
+        self.switched_at = self.clock()
+        fade_in = self.active
+        if self.crossfade > 0:
+            fade_in.volume = 0
+            fade_in.play()
+            self.fade_stop.clear()
+            self.fader = threading.Thread(
+                target=self.fade, args=(fade_out, fade_in), daemon=True)
+            self.fader.start()
+
+        else:
+            fade_in.volume = self.volume
+            fade_in.play()
+            fade_out.stop()
+
+    def fade(self, fade_out, fade_in):
+        start = self.clock()
+        while (elapsed := self.clock() - start) < self.crossfade and not self.fade_stop.is_set():
+            level = elapsed / self.crossfade
+            fade_out.volume = self.volume * (1 - level)
+            fade_in.volume = self.volume * level
+            self.sleep(FADE_STEP)
+
+        with self.lock:
+            fade_in.volume = self.volume
+            fade_out.stop()
+            self.fader = None
+            if self.preload_url != self.preloaded:
+                self.load_standby()
+
+    def stop_fade(self):
+        if (fader := self.fader) is not None:
+            self.fade_stop.set()
+            fader.join()
+
+    def play(self):
+        self.active.play()
+
+    def pause(self, pause):
+        # pausing ends a crossfade on the song faded in, playing on does not
+        if pause:
+            self.stop_fade()
+        self.active.pause(pause)
+
+    @property
+    def volume(self):
+        return self.volume_
+
+    @volume.setter
+    def volume(self, val):
+        self.volume_ = int(val)
+        if self.fader is None:
+            self.active.volume = self.volume_
+
+    def stop(self):
+        self.stop_fade()
+        for player in self.players:
+            player.stop()
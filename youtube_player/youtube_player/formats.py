@@ -0,0 +1,96 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+PREFERRED_CODECS = ('opus', 'mp4a', 'vorbis')
+PREFERRED_PROTOCOLS = ('https', 'http')
+QUALITY_BITRATES = (64, 144, 192)
+
+
+class AudioFormat:
+    ''' Audio only format of a video as resolved by yt-dlp: the stream url,
+        the average bitrate in kbit/s (0 if unknown), the codec without its
+        profile ('opus', 'mp4a'), the file size in bytes and the protocol
+    '''
+    __slots__ = ('url', 'abr', 'codec', 'filesize', 'protocol')
+
+    def __init__(self, url, abr=0, codec=None, filesize=None, protocol=None):
+        self.url = url
+        self.abr = abr
+        self.codec = codec
+        self.filesize = filesize
+        self.protocol = protocol
+
+    @classmethod
+    def from_info(cls, info_format):
+        codec = info_format.get('acodec')
+        return cls(
+            info_format['url'],
+            info_format.get('abr') or info_format.get('tbr') or 0,
+            codec.split('.')[0] if codec and codec != 'none' else None,
+            info_format.get('filesize') or info_format.get('filesize_approx'),
+            info_format.get('protocol'),
+        )
+
+    @classmethod
+    def from_dict(cls, format_dict):
+        return cls(**format_dict)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        return f'{round(self.abr)}k {self.codec}' if self.codec else f'{round(self.abr)}k'
+
+    def __repr__(self):
+        return f'AudioFormat({self.abr!r}, {self.codec!r}, {self.protocol!r})'
+
+
+def audio_formats(info):
+    ''' the audio only formats in the yt-dlp info of a video, lowest bitrate
+        first
+    '''
+    return sorted(
+        (
+            AudioFormat.from_info(info_format) for info_format in info['formats']
+            if info_format.get('resolution') == 'audio only'
+        ),
+        key=lambda audio_format: audio_format.abr
+    )
+
+
+def select_format(formats, max_bitrate=None, codec=None):
+    ''' the format with the highest bitrate up to max_bitrate (kbit/s, None
+        for the best), or the lowest bitrate if none is low enough. Formats of
+        codec are taken if there are any; on equal bitrate direct streams come
+        before manifests and codecs are ranked by PREFERRED_CODECS
+    '''
+    if not formats:
+        return None
+
+    if codec and (of_codec := [fmt for fmt in formats if fmt.codec == codec]):
+        formats = of_codec
+
+    def rank(fmt):
+        protocol_rank = (
+            PREFERRED_PROTOCOLS.index(fmt.protocol) if fmt.protocol in PREFERRED_PROTOCOLS
+            else len(PREFERRED_PROTOCOLS))
+        codec_rank = (
+            PREFERRED_CODECS.index(fmt.codec) if fmt.codec in PREFERRED_CODECS
+            else len(PREFERRED_CODECS))
+        return fmt.abr, -protocol_rank, -codec_rank
+
+    if fitting := [fmt for fmt in formats if max_bitrate is None or fmt.abr <= max_bitrate]:
+        return max(fitting, key=rank)
+
+    return min(formats, key=lambda fmt: fmt.abr)
+
+
+def quality_bitrate(quality_level):
+    ''' maximum bitrate of a quality level: 0, 1, 2 take QUALITY_BITRATES,
+        higher levels and 'max' the best format
+    '''
+    if quality_level == 'max' or quality_level >= len(QUALITY_BITRATES):
+        return None
+
+    return QUALITY_BITRATES[quality_level]
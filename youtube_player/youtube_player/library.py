@@ -0,0 +1,88 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import os
+import re
+import json
+import threading
+from pathlib import Path
+
+LIBRARY_FILE = Path.home() / '.youtube_player' / 'library.json'
+DIRECTORY_LIBRARY = 'library.json'
+MEDIA_FILE = re.compile(r'\[([\w-]{11})\]\.(\w+)$')
+
+
+class MediaLibrary:
+    ''' Index of downloaded songs, mapping video id to the file path, codec,
+        bitrate (kbit/s) and duration (seconds). There is one index, kept in
+        filename, for the songs of all download directories; a directory is
+        scanned when it is chosen for downloads: files named
+        '<title> [<video id>].<codec>' and the entries of a library.json kept
+        in the directory by earlier versions are added
+    '''
+    def __init__(self, filename=LIBRARY_FILE):
+        self.filename = Path(filename)
+        self.lock = threading.Lock()
+        self.media = {}
+        if self.filename.exists():
+            with open(self.filename, 'r') as jsonfile:
+                self.media = json.load(jsonfile)
+
+    def scan(self, directory):
+        directory = Path(directory)
+        if not directory.is_dir():
+            return
+
+        with self.lock:
+            found = {}
+            if (index := directory / DIRECTORY_LIBRARY).exists() and index != self.filename:
+                with open(index, 'r') as jsonfile:
+                    found.update(json.load(jsonfile))
+
+            for path in directory.iterdir():
+                if match := MEDIA_FILE.search(path.name):
+                    found.setdefault(match.group(1), {
+                        'path': str(path), 'codec': match.group(2),
+                        'bitrate': None, 'duration': None,
+                    })
+
+            if found := {
+                    video_id: media for video_id, media in found.items()
+                    if video_id not in self.media}:
+                self.media.update(found)
+                self.save()
+
+    def add(self, video_id, path, codec, bitrate=None, duration=None):
+        with self.lock:
+            self.media[video_id] = {
+                'path': str(path), 'codec': codec, 'bitrate': bitrate, 'duration': duration,
+            }
+            self.save()
+
+    def lookup(self, video_id):
+        ''' media entry of video_id, entries of which the file has been removed
+            are dropped
+        '''
+        with self.lock:
+            if (media := self.media.get(video_id)) is None:
+                return None
+
+            if not os.path.exists(media['path']):
+                del self.media[video_id]
+                return None
+
+            return media
+
+    def save(self):
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.filename.with_suffix('.part')
+        with open(partial, 'w') as jsonfile:
+            json.dump(self.media, jsonfile)
+        os.replace(partial, self.filename)
+
+    def __contains__(self, video_id):
+        return self.lookup(video_id) is not None
+
+    def __len__(self):
+        return len(self.media)
@@ -4,117 +4,417 @@ https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player
 '''
 import re
 import json
-from youtube_search import YoutubeSearch
-import vlc
-import yt_dlp
+import queue
+import time
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from youtube_player.cache import StreamCache, SearchCache, CACHE_FILE
+from youtube_player.backend import VlcBackend
+from youtube_player.engine import DualPlayer
+from youtube_player.formats import audio_formats
+from youtube_player.warmer import WARM_WORKERS
+from youtube_player.library import MediaLibrary, LIBRARY_FILE
+from youtube_player.playlist import Playlist, PlaylistFile, PLAYLIST_SUFFIX, DUPLICATE_POLICIES
+from youtube_player.song import (
+    Song, video_id, parse_duration, song_is_short, MAX_SONG_LENGTH
+)
 
 MAX_SEARCH_RESULTS = 40
-MAX_SONG_LENGTH = 300
-YOUTUBE_BASE_URL = 'https://www.youtube.com'
+SEARCH_PAGE_SIZE = 10
 INVALID_CHARS = re.compile(r'[^a-zA-Z0-9 .,:;+-=!?/()öäßü]')
+EXTRACTOR_POOL_SIZE = 2
+EXTRACT_OPTIONS = {}
+DOWNLOAD_DIR = Path.home() / 'Music' / 'youtube_player'
+MAX_DOWNLOADS = 3
+DOWNLOAD_OPTIONS = {
+    'format': 'bestaudio/best',
+    'outtmpl': '%(id)s.%(ext)s',
+    'continuedl': True,
+    'noprogress': True,
+}
+UNAVAILABLE_ERRORS = re.compile(
+    r'video unavailable|private video|been removed|terminated|no audio formats', re.IGNORECASE)
+
+
+def is_unavailable(error) -> bool:
+    ''' True if error says the video is gone for good, as opposed to a
+        network or extractor error that may pass
+    '''
+    return bool(UNAVAILABLE_ERRORS.search(str(error)))
+
+
+class ExtractorPool:
+    ''' Pool of long lived yt_dlp.YoutubeDL instances sharing the same options.
+        Instances are created on demand up to size and each is used by one
+        thread at a time, so extractors, cookies and the url opener are set up
+        once instead of on every call. yt_dlp, which loads hundreds of
+        extractor modules, is imported when the first instance is made
+    '''
+    def __init__(self, options, size=EXTRACTOR_POOL_SIZE, factory=None):
+        self.options = options
+        self.size = size
+        self.factory = factory
+        self.created = 0
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+
+        except queue.Empty:
+            pass
 
+        # a slot is taken before the instance is made and given back if
+        # making it fails, so a failed import does not shrink the pool
+        with self.lock:
+            reserved = self.created < self.size
+            if reserved:
+                self.created += 1
 
-def song_is_short(duration: str) -> bool:
-    try:
-        hms = duration.split(':')
-        if len(hms) == 3:
-            seconds = int(hms[0]) * 3600 + int(hms[1]) * 60 + int(hms[2])
+        if not reserved:
+            return self.idle.get()
 
-        elif len(hms) == 2:
-            seconds = int(hms[0]) * 60 + int(hms[1])
+        try:
+            return self.create()
 
-        else:
-            return False
+        except BaseException:
+            with self.lock:
+                self.created -= 1
+            raise
 
-        if seconds < MAX_SONG_LENGTH:
-            return True
+    def create(self):
+        if self.factory is None:
+            import yt_dlp
+            self.factory = yt_dlp.YoutubeDL
+        return self.factory(self.options)
 
-        else:
-            return False
+    def release(self, ydl):
+        self.idle.put(ydl)
 
-    except ValueError:
-        return False
+    @contextmanager
+    def extractor(self):
+        ydl = self.acquire()
+        try:
+            yield ydl
+
+        finally:
+            self.release(ydl)
+
+    def close(self):
+        while True:
+            try:
+                ydl = self.idle.get_nowait()
+
+            except queue.Empty:
+                return
+
+            ydl.__exit__(None, None, None)
 
 
 class YouTubePlayerModel:
     ''' Class with methods to search songs on YouTube, get
-        audio urls, play song with a vlc player and provide
-        API
+        audio urls, play song with a playback backend (vlc by default, a
+        NullBackend with a SimulatedClock runs headless) and provide API
     '''
-    def __init__(self, short_song: bool=False):
+    def __init__(self, short_song: bool=False, cache_file=CACHE_FILE, download_dir=DOWNLOAD_DIR,
+                 library_file=LIBRARY_FILE, backend=VlcBackend, clock=None):
         self.short_song_ = short_song
-        self.vlc_instance = vlc.Instance()
-        self.player = self.vlc_instance.media_player_new()
-        self.playlist_ = []
-
-    def search(self, search_query):
-        results = YoutubeSearch(
-            search_query, max_results=MAX_SEARCH_RESULTS
-        ).to_dict()
-
-        song_list = []
-        for result in results:
-            if self.short_song_ and not song_is_short(result['duration']):
-                continue
-
-            song_list.append({
-                'url': ''.join([YOUTUBE_BASE_URL, "/watch?v=", result['id']]),
-                'title': re.sub(INVALID_CHARS, '', result['title']),
-                'duration': result['duration']
-            })
-
-        return song_list
-
-    def get_audio_urls(self, url):
-        audio_urls = []
-        with yt_dlp.YoutubeDL({}) as ydl:
+        self.short_song_length_ = MAX_SONG_LENGTH
+        self.stream_cache = StreamCache(cache_file)
+        self.search_cache = SearchCache()
+        self.extractors = ExtractorPool(EXTRACT_OPTIONS)
+        self.warm_extractors = ExtractorPool(EXTRACT_OPTIONS, size=WARM_WORKERS)
+        self.download_hooks = {}
+        self.library = MediaLibrary(library_file)
+        self.set_download_dir(download_dir)
+        self.players = DualPlayer(
+            backend, clock=clock if clock else time.monotonic,
+            sleep=clock.sleep if clock else time.sleep)
+        self.playlist_ = Playlist()
+        self.playlist_file = None
+        self.pending_saves = []
+        self.dedupe_pending = False
+        self.position = 0
+        self.started = False
+        self.generation = 0
+
+    def search_pages(self, search_query, page_size=SEARCH_PAGE_SIZE,
+                     max_results=MAX_SEARCH_RESULTS):
+        ''' generator of the search results in pages of page_size songs. The
+            youtube search returns one page of results per request, pages
+            are cut from it so a view can show the first songs right away
+        '''
+        # the cache holds the unfiltered results, so toggling short song
+        # filters the cached results again instead of searching again
+        if (song_list := self.search_cache.get(search_query, max_results)) is None:
+            from youtube_search import YoutubeSearch
+            results = YoutubeSearch(
+                search_query, max_results=max_results
+            ).to_dict()
+
+            song_list = [
+                Song(
+                    result['id'], re.sub(INVALID_CHARS, '', result['title']),
+                    parse_duration(result['duration']))
+                for result in results
+            ]
+            self.search_cache.put(search_query, song_list, max_results)
+
+        for start in range(0, len(song_list), page_size):
+            page = [
+                song for song in song_list[start:start + page_size]
+                if not self.short_song_ or song_is_short(song.seconds, self.short_song_length_)
+            ]
+            if page:
+                yield page
+
+    def search(self, search_query, max_results=MAX_SEARCH_RESULTS):
+        return [
+            song for page in self.search_pages(search_query, max_results=max_results)
+            for song in page
+        ]
+
+    def cached_audio_formats(self, url):
+        return self.stream_cache.get(video_id(url))
+
+    def invalidate_audio_formats(self, url):
+        self.stream_cache.invalidate(video_id(url))
+
+    def local_media(self, url):
+        ''' file mrl of the downloaded song if it is in the library
+        '''
+        if media := self.library.lookup(video_id(url)):
+            return Path(media['path']).resolve().as_uri()
+
+        return None
+
+    def get_audio_formats(self, url, refresh=False):
+        ''' the audio only formats of url, lowest bitrate first, and the title
+        '''
+        if not refresh and (cached := self.cached_audio_formats(url)):
+            return cached
+
+        formats, info = self.extract_audio_formats(url, self.extractors)
+        return formats, info['title']
+
+    def extract_audio_formats(self, url, extractors):
+        with extractors.extractor() as ydl:
             info = ydl.extract_info(url, download=False)
-            title = info['title']
 
-            # get the audio urls different quality resolutions
-            for format in info['formats']:
-                if format['resolution'] == 'audio only':
-                    audio_urls.append(format['url'])
-        return audio_urls, title
+        formats = audio_formats(info)
+        if formats:
+            self.stream_cache.put(video_id(url), formats, info['title'])
+        return formats, info
+
+    def resolve_song(self, song):
+        ''' song with title and duration as on YouTube, its audio formats are
+            put in the stream cache; raises an error if the song has no
+            audio. Uses extractors of its own, so resolving a playlist does
+            not hold up the song to play
+        '''
+        formats, info = self.extract_audio_formats(song.url, self.warm_extractors)
+        if not formats:
+            raise ValueError(f'no audio formats for {song.url}')
+
+        return Song(
+            song.video_id, re.sub(INVALID_CHARS, '', info.get('title') or song.title),
+            int(info['duration']) if info.get('duration') else song.seconds)
+
+    def attach_events(self, callback):
+        ''' call callback(event, value, generation) on end of track, error and
+            buffering (value is the percentage buffered) of the active player,
+            with 'playing' (value the time in ms) when a loaded stream starts
+            playing, and once per song with 'crossfade' when the crossfade to a
+            preloaded song is due; the backend calls it on its event thread,
+            so callback must hand the event over to the gui thread. generation
+            is that of the load the event belongs to, an event handled after
+            another load is stale
+        '''
+        for player in self.players.players:
+            self.attach_player_events(player, callback)
+
+    def attach_player_events(self, player, callback):
+        # events of the standby player, which is preloading or fading out,
+        # are ignored, except for the length of the song it preloads; the
+        # backend must not be called from the event thread, so the length and
+        # the last known position are tracked from events
+        song_length = 0
+        crossfade_due = False
+
+        def on_event(event, value):
+            nonlocal song_length, crossfade_due
+            if event == 'length':
+                song_length = value
+                crossfade_due = False
+                return
+
+            if player is not self.players.active:
+                return
+
+            match event:
+                case 'time':
+                    self.position = value
+                    if not self.started:
+                        self.started = True
+                        callback('playing', value, self.generation)
+
+                    if (crossfade_due or not self.players.crossfade
+                            or not self.players.preloaded or song_length <= 0):
+                        return
+
+                    if song_length - value <= self.players.crossfade * 1000:
+                        crossfade_due = True
+                        callback('crossfade', None, self.generation)
+                case _:
+                    callback(event, value, self.generation)
+
+        player.attach(on_event)
+
+    def get_player(self, url, start=0):
+        ''' load url to play from start (ms), returns True if the preloaded
+            url was switched to, which is playing already
+        '''
+        self.position = start
+        self.started = False
+        self.generation += 1
+        return self.players.load(url, start)
 
-    def get_player(self, url):
-        media = self.vlc_instance.media_new(url)
-        media.get_mrl()
-        self.player.set_media(media)
+    def preload(self, url):
+        self.players.preload(url)
 
     def play(self):
-        self.player.play()
+        self.players.play()
 
     def pause(self, pause):
-        self.player.set_pause(pause)
+        self.players.pause(pause)
+
+    @property
+    def player(self):
+        return self.players.active
 
     def open_playlist(self, filename):
-        self.playlst = []
-        with open(filename, 'r') as jsonfile:
-            self.playlist_ = json.load(jsonfile)
+        ''' start a new playlist from filename, returns a generator of the
+            songs in chunks to be added with load_songs
+        '''
+        self.playlist_file = PlaylistFile(filename)
+        self.playlist_ = Playlist(short_length=self.short_song_length_)
+        self.pending_saves = []
+        self.dedupe_pending = False
+        return self.playlist_file.read()
+
+    def load_songs(self, songs):
+        self.playlist_.extend(songs)
+
+    def update_song(self, song, index=None):
+        return self.playlist_.update(song, index)
+
+    def playlist_updated(self):
+        # the playlist file is rewritten in one go once the updates are done
+        if self.playlist_file:
+            self.playlist_file.write(self.playlist_)
+
+    def playlist_loaded(self):
+        ''' end of loading the playlist: a dedupe asked for while loading is
+            done, the playlist file is brought up to date and pending saves
+            are written. Returns the number of songs removed by the dedupe
+        '''
+        removed = self.playlist_.dedupe() if self.dedupe_pending else 0
+        self.dedupe_pending = False
+        if removed:
+            self.playlist_file.write(self.playlist_)
+        self.playlist_file.loaded(self.playlist_)
+        for filename in self.pending_saves:
+            self.save_playlist(filename)
+        self.pending_saves = []
+        return removed
+
+    @property
+    def playlist_loading(self) -> bool:
+        return self.playlist_file is not None and self.playlist_file.loading
 
     def save_playlist(self, filename):
+        ''' a .jsonl playlist becomes the playlist file kept up to date with
+            the edits, other files are saved as json. A playlist that is
+            still loading is saved once it is loaded
+        '''
+        if self.playlist_loading:
+            self.pending_saves.append(filename)
+            return
+
+        if Path(filename).suffix == PLAYLIST_SUFFIX:
+            self.playlist_file = PlaylistFile(filename)
+            self.playlist_file.write(self.playlist_)
+            return
+
         with open(filename, 'w') as jsonfile:
-            json.dump(self.playlist_, jsonfile)
+            json.dump(list(self.playlist_.to_dicts()), jsonfile)
 
     def clear_playlist(self):
-        self.playlist_ = []
-
-    def extend_playlist(self, playlist_to_add):
-        self.playlist_.extend(playlist_to_add)
+        self.playlist_ = Playlist(short_length=self.short_song_length_)
+        if self.playlist_file:
+            self.playlist_file.clear()
+
+    def extend_playlist(self, playlist_to_add, duplicates='allow'):
+        ''' add songs to the playlist, returns the songs added. A song that is
+            in the playlist already is added again with duplicates 'allow',
+            left out with 'skip' and with 'merge' its title and duration
+            replace those of the song in the playlist
+        '''
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f'duplicates must be one of {DUPLICATE_POLICIES}: {duplicates}')
+
+        songs = []
+        merged = False
+        for song in playlist_to_add:
+            if duplicates == 'allow' or song.video_id not in self.playlist_:
+                self.playlist_.append(song)
+                songs.append(song)
+
+            elif duplicates == 'merge':
+                merged = self.playlist_.update(song) or merged
+
+        if self.playlist_file:
+            if merged:
+                self.playlist_file.write(self.playlist_)
+
+            else:
+                self.playlist_file.append(songs)
+        return songs
+
+    def add_to_playlist(self, song, duplicates='allow'):
+        return bool(self.extend_playlist([song], duplicates))
+
+    def dedupe_playlist(self):
+        ''' remove repeated songs from the playlist, the first entry of each
+            song is kept; returns the number of songs removed. A playlist
+            that is still loading is deduped once it is loaded
+        '''
+        if self.playlist_loading:
+            self.dedupe_pending = True
+            return 0
 
-    def add_to_playlist(self, song_dict):
-        self.playlist_.append(song_dict)
+        if (removed := self.playlist_.dedupe()) and self.playlist_file:
+            self.playlist_file.write(self.playlist_)
+        return removed
 
     def remove_from_playlist(self, index):
         if index not in range(len(self.playlist_)):
             return
-        del self.playlist_[index]
+
+        self.playlist_.remove(index)
+        if self.playlist_file:
+            self.playlist_file.remove(index, self.playlist_)
 
     @property
     def playlist(self):
         return self.playlist_
 
+    @property
+    def search_cache_stats(self):
+        return self.search_cache.stats()
+
     @property
     def short_song(self) -> bool:
         return self.short_song_
@@ -123,40 +423,87 @@ class YouTubePlayerModel:
     def short_song(self, val: bool) -> None:
         self.short_song_ = val
 
+    @property
+    def short_song_length(self) -> int:
+        return self.short_song_length_
+
+    @short_song_length.setter
+    def short_song_length(self, val: int) -> None:
+        self.short_song_length_ = int(val)
+        self.playlist_.short_length = self.short_song_length_
+
+    @property
+    def crossfade(self) -> float:
+        return self.players.crossfade
+
+    @crossfade.setter
+    def crossfade(self, seconds: float) -> None:
+        self.players.crossfade = max(0.0, float(seconds))
+
+    @property
+    def error(self) -> bool:
+        return self.player.error
+
     @property
     def length(self):
-        return self.player.get_length()
+        return self.player.length
 
     @property
     def time(self):
-        return self.player.get_time()
+        return self.player.time
 
     @time.setter
     def time(self, val):
-        self.player.set_time(val)
+        self.player.seek(val)
 
     @property
     def volume(self):
-        self.player.audio_get_volume()
+        return self.players.volume
 
     @volume.setter
     def volume(self, val):
-        self.player.audio_set_volume(int(val))
-
-    def download(self, url, title):
-        ''' download method is not implemented
+        self.players.volume = val
+
+    def set_download_dir(self, download_dir):
+        if hasattr(self, 'downloaders'):
+            self.downloaders.close()
+
+        self.download_dir = Path(download_dir)
+        self.library.scan(self.download_dir)
+        self.downloaders = ExtractorPool({
+            **DOWNLOAD_OPTIONS,
+            'paths': {'home': str(self.download_dir)},
+            'progress_hooks': [self.download_progress],
+        }, size=MAX_DOWNLOADS)
+
+    def download_progress(self, status):
+        if hook := self.download_hooks.get(status['info_dict'].get('id')):
+            hook(status)
+
+    def download(self, url, progress_hook=None):
+        ''' download the best audio of url to the download directory, an
+            existing partial download is resumed. Returns the filename and the
+            yt-dlp info of the download
         '''
-        output_template = f'{title}.%(ext)s'
-        ydl_options = {
-            'format': 'bestaudio/best',
-            'outtmpl': output_template,
-            'postprocessors': [
-                {'key': 'FFmpegExtractAudio','preferredcodec': 'mp3',
-                   'preferredquality': '192',
-                },
-                {'key': 'FFmpegMetadata'},
-            ],
-        }
-        with yt_dlp.YoutubeDL(ydl_options) as ydl:
-            _ = ydl.extract_info(YOUTUBE_BASE_URL + url, download=True)
+        key = video_id(url)
+        if progress_hook:
+            self.download_hooks[key] = progress_hook
+
+        try:
+            with self.downloaders.extractor() as ydl:
+                info = ydl.extract_info(url, download=True)
+                if downloads := info.get('requested_downloads'):
+                    return downloads[0]['filepath'], info
+
+                return ydl.prepare_filename(info), info
+
+        finally:
+            self.download_hooks.pop(key, None)
+
+    def close(self):
+        self.players.stop()
+        self.extractors.close()
+        self.warm_extractors.close()
+        self.downloaders.close()
+        self.stream_cache.close()
 
@@ -0,0 +1,396 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import os
+import json
+import mmap
+import bisect
+import itertools
+from array import array
+from pathlib import Path
+from youtube_player.song import Song, song_is_short, MAX_SONG_LENGTH
+
+PLAYLIST_SUFFIX = '.jsonl'
+CHUNK_SIZE = 1000
+DUPLICATE_POLICIES = ('skip', 'allow', 'merge')
+POSITIONS_REBUILD = 1024
+
+
+class Playlist:
+    ''' List of songs with a cursor on the song that plays next. The songs are
+        stored in columns (video ids, interned titles and an array of seconds)
+        and a Song record is made on access. Moving the cursor and appending
+        songs are O(1); removing the song at the cursor is a deletion from each
+        column. The number of entries of each video id is counted, so
+        membership is O(1). The index of a video id is looked up in a map that
+        keeps the indices it was made with: the removals since are kept in a
+        sorted list and subtracted on lookup, and the map is made again after
+        POSITIONS_REBUILD removals. The next short song is found in a sorted
+        list of the positions of short songs, rebuilt on first use after a
+        removal
+    '''
+    def __init__(self, songs=(), short_length=MAX_SONG_LENGTH):
+        self.video_ids = []
+        self.titles = []
+        self.seconds = array('l')
+        self.counts = {}
+        self.cursor = 0
+        self.positions_ = None
+        self.removed_ = []
+        self.short_length_ = short_length
+        self.short_positions_ = None
+        self.extend(songs)
+
+    @classmethod
+    def from_dicts(cls, song_dicts, short_length=MAX_SONG_LENGTH):
+        return cls((Song.from_dict(song_dict) for song_dict in song_dicts), short_length)
+
+    def to_dicts(self):
+        return (song.to_dict() for song in self)
+
+    @property
+    def current(self):
+        return self[self.cursor] if self.video_ids else None
+
+    def next(self):
+        if self.video_ids:
+            self.cursor = (self.cursor + 1) % len(self.video_ids)
+
+    def prev(self):
+        if self.video_ids:
+            self.cursor = (self.cursor - 1) % len(self.video_ids)
+
+    def move_to(self, index):
+        if index in range(len(self.video_ids)):
+            self.cursor = index
+
+    def upcoming(self, short_only=False):
+        ''' songs from the cursor onwards, wrapping around to the start
+        '''
+        if short_only:
+            positions = self.short_positions
+            start = bisect.bisect_left(positions, self.cursor)
+            indexes = itertools.chain(
+                itertools.islice(positions, start, None), itertools.islice(positions, 0, start))
+
+        else:
+            indexes = itertools.chain(
+                range(self.cursor, len(self.video_ids)), range(0, self.cursor))
+
+        return (self[index] for index in indexes)
+
+    @property
+    def short_length(self):
+        return self.short_length_
+
+    @short_length.setter
+    def short_length(self, val):
+        self.short_length_ = val
+        self.short_positions_ = None
+
+    @property
+    def short_positions(self):
+        if self.short_positions_ is None:
+            self.short_positions_ = [
+                index for index, seconds in enumerate(self.seconds)
+                if song_is_short(seconds, self.short_length_)
+            ]
+        return self.short_positions_
+
+    def next_short(self):
+        ''' position of the first short song from the cursor onwards, wrapping
+            around to the start; None if there are no short songs
+        '''
+        if not (positions := self.short_positions):
+            return None
+
+        start = bisect.bisect_left(positions, self.cursor)
+        return positions[start] if start < len(positions) else positions[0]
+
+    def append(self, song):
+        if self.positions_ is not None and song.video_id not in self.counts:
+            self.positions_[song.video_id] = len(self.video_ids) + len(self.removed_)
+        if self.short_positions_ is not None and song_is_short(song.seconds, self.short_length_):
+            self.short_positions_.append(len(self.video_ids))
+        self.counts[song.video_id] = self.counts.get(song.video_id, 0) + 1
+        self.video_ids.append(song.video_id)
+        self.titles.append(song.title)
+        self.seconds.append(song.seconds)
+
+    def extend(self, songs):
+        for song in songs:
+            self.append(song)
+
+    def remove(self, index):
+        if index not in range(len(self.video_ids)):
+            return
+
+        video_id = self.video_ids[index]
+        if (count := self.counts[video_id] - 1):
+            self.counts[video_id] = count
+
+        else:
+            del self.counts[video_id]
+
+        key = self.position_key(index)
+        del self.video_ids[index]
+        del self.titles[index]
+        del self.seconds[index]
+        self.remove_position(video_id, key)
+        self.short_positions_ = None
+        if index < self.cursor:
+            self.cursor -= 1
+
+        if self.cursor >= len(self.video_ids):
+            self.cursor = 0
+
+    def update(self, song, index=None):
+        ''' set title and duration of the entry at index, or the first with
+            the video id of song if index no longer holds it; returns True if
+            the entry changed
+        '''
+        if index is None or index >= len(self.video_ids) or self.video_ids[index] != song.video_id:
+            if (index := self.position(song.video_id)) is None:
+                return False
+
+        if self.titles[index] == song.title and self.seconds[index] == song.seconds:
+            return False
+
+        self.titles[index] = song.title
+        self.seconds[index] = song.seconds
+        self.short_positions_ = None
+        return True
+
+    def dedupe(self):
+        ''' remove all but the first entry of each video id in one pass,
+            returns the number of entries removed
+        '''
+        removed = len(self.video_ids) - len(self.counts)
+        if not removed:
+            return 0
+
+        seen = set()
+        keep = []
+        cursor = None
+        for index, video_id in enumerate(self.video_ids):
+            if cursor is None and index >= self.cursor:
+                cursor = len(keep)
+            if video_id not in seen:
+                seen.add(video_id)
+                keep.append(index)
+
+        self.video_ids = [self.video_ids[index] for index in keep]
+        self.titles = [self.titles[index] for index in keep]
+        self.seconds = array('l', (self.seconds[index] for index in keep))
+        self.counts = dict.fromkeys(self.video_ids, 1)
+        self.cursor = cursor if cursor is not None and cursor < len(keep) else 0
+        self.positions_ = None
+        self.short_positions_ = None
+        return removed
+
+    def count(self, video_id):
+        return self.counts.get(video_id, 0)
+
+    def clear(self):
+        self.video_ids = []
+        self.titles = []
+        self.seconds = array('l')
+        self.counts = {}
+        self.cursor = 0
+        self.positions_ = None
+        self.short_positions_ = None
+
+    def position(self, video_id):
+        ''' index of the first song with video_id in the playlist
+        '''
+        if self.positions_ is None:
+            self.positions_ = {}
+            self.removed_ = []
+            for index, id_ in enumerate(self.video_ids):
+                self.positions_.setdefault(id_, index)
+
+        if (key := self.positions_.get(video_id)) is None:
+            # the first entry of a song in the playlist more than once has
+            # been removed, the next one is looked up when asked for
+            if video_id not in self.counts:
+                return None
+
+            index = self.video_ids.index(video_id)
+            self.positions_[video_id] = self.position_key(index)
+            return index
+
+        return key - bisect.bisect_left(self.removed_, key)
+
+    def position_key(self, index):
+        # the index of the map of positions that index had when the map was made
+        for removed in self.removed_:
+            if removed > index:
+                break
+            index += 1
+        return index
+
+    def remove_position(self, video_id, key):
+        # update the map of positions for the removal of video_id at index
+        if self.positions_ is None:
+            return
+
+        if len(self.removed_) >= POSITIONS_REBUILD:
+            self.positions_ = None
+            return
+
+        bisect.insort(self.removed_, key)
+        if self.positions_.get(video_id) == key:
+            del self.positions_[video_id]
+
+    def __getitem__(self, index):
+        return Song(self.video_ids[index], self.titles[index], self.seconds[index])
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self.video_ids)))
+
+    def __contains__(self, video_id):
+        return video_id in self.counts
+
+    def __len__(self):
+        return len(self.video_ids)
+
+
+class PlaylistFile:
+    ''' Playlist file in json lines: a song {"url": ..., "title": ...,
+        "duration": ...} per line. Added songs are appended and a removal is
+        appended as {"remove": index}, so an edit writes one line instead of
+        the whole playlist; the file is compacted when the removals outnumber
+        the songs, and on reading a file with removals. While the file is
+        being read, edits and rewrites only mark it dirty and the whole
+        playlist is written once it is loaded.
+        A .json playlist is imported into a .jsonl file next to it, unless
+        that file is newer
+    '''
+    def __init__(self, filename):
+        filename = Path(filename)
+        self.source = None
+        if filename.suffix != PLAYLIST_SUFFIX:
+            self.source = filename
+            filename = filename.with_suffix(PLAYLIST_SUFFIX)
+            if filename.exists() and filename.stat().st_mtime >= self.source.stat().st_mtime:
+                self.source = None
+
+        self.filename = filename
+        self.songs = 0
+        self.removals = 0
+        self.loading = False
+        self.dirty = False
+
+    def read(self, chunk_size=CHUNK_SIZE):
+        ''' generator of the songs in lists of chunk_size, so a playlist can
+            show its first songs while the rest is read. A file that has to
+            be imported or compacted first starts with an empty chunk, so that
+            work is done while the following chunks are read
+        '''
+        self.loading = True
+        compact = not self.source and self.has_removals()
+        if self.source or compact:
+            yield []
+
+        if self.source:
+            with open(self.source, 'r') as jsonfile:
+                songs = [Song.from_dict(song_dict) for song_dict in json.load(jsonfile)]
+            self.write_songs(songs)
+
+        elif compact:
+            songs = Playlist()
+            with open(self.filename, 'r') as jsonlfile:
+                for line in jsonlfile:
+                    if (record := json.loads(line)).keys() == {'remove'}:
+                        songs.remove(record['remove'])
+
+                    else:
+                        songs.append(Song.from_dict(record))
+            self.write_songs(songs)
+
+        else:
+            songs = None
+
+        if songs is not None:
+            for start in range(0, len(songs), chunk_size):
+                yield [songs[index] for index in range(start, min(start + chunk_size, len(songs)))]
+            return
+
+        if not self.filename.exists():
+            return
+
+        with open(self.filename, 'r') as jsonlfile:
+            while chunk := [
+                Song.from_dict(json.loads(line))
+                for line in itertools.islice(jsonlfile, chunk_size) if line.strip()
+            ]:
+                self.songs += len(chunk)
+                yield chunk
+
+    def has_removals(self):
+        if not self.filename.exists() or self.filename.stat().st_size == 0:
+            return False
+
+        with open(self.filename, 'rb') as jsonlfile:
+            with mmap.mmap(jsonlfile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return data.find(b'{"remove"') >= 0
+
+    def loaded(self, playlist):
+        ''' end of loading; the file is rewritten from playlist if it has
+            been edited while loading
+        '''
+        self.loading = False
+        if self.dirty:
+            self.write_songs(playlist)
+
+    def append(self, songs):
+        if self.loading:
+            self.dirty = True
+            return
+
+        self.append_lines(json.dumps(song.to_dict()) for song in songs)
+        self.songs += len(songs)
+
+    def remove(self, index, playlist):
+        ''' record removal of the song at index, playlist is the playlist
+            after the removal
+        '''
+        if self.loading:
+            self.dirty = True
+            return
+
+        self.removals += 1
+        if self.removals > len(playlist):
+            self.write(playlist)
+
+        else:
+            self.append_lines([json.dumps({'remove': index})])
+
+    def clear(self):
+        self.loading = False
+        self.write_songs(())
+
+    def append_lines(self, lines):
+        with open(self.filename, 'a') as jsonlfile:
+            jsonlfile.writelines(line + '\n' for line in lines)
+
+    def write(self, songs):
+        ''' rewrite the file with songs; while loading songs are not all
+            there yet, the file is rewritten when loading has finished
+        '''
+        if self.loading:
+            self.dirty = True
+            return
+
+        self.write_songs(songs)
+
+    def write_songs(self, songs):
+        partial = self.filename.with_suffix('.part')
+        with open(partial, 'w') as jsonlfile:
+            jsonlfile.writelines(json.dumps(song.to_dict()) + '\n' for song in songs)
+        os.replace(partial, self.filename)
+        self.source = None
+        self.songs = len(songs)
+        self.removals = 0
+        self.dirty = False
@@ -0,0 +1,232 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import json
+import asyncio
+import threading
+import ipaddress
+from pathlib import Path
+from concurrent.futures import Future
+
+STATUS_INTERVAL = 1.0
+MAX_WRITE_BUFFER = 64 * 1024
+BACKLOG = 1024
+COMMANDS = frozenset([
+    'open_playlist', 'save_playlist', 'download_playlist', 'warm_playlist', 'clear_playlist',
+    'import_all_to_playlist', 'dedupe_playlist', 'set_duplicates', 'query_songs',
+    'query_prev', 'query_next', 'query_play', 'query_add_song', 'pl_play_prev', 'pl_play_next', 'pl_play_or_pause', 'pl_song_back',
+    'pl_song_forward', 'pl_prev', 'pl_next', 'pl_remove_song', 'set_song_time', 'set_volume',
+    'set_quality', 'set_codec', 'set_lookahead', 'set_crossfade', 'set_short_song_length',
+    'set_shuffle_seed', 'toggle_autoplay', 'toggle_short_song', 'toggle_shuffle',
+    'prefetch_stats', 'failover_stats', 'status', 'quit',
+])
+
+
+def address_of(address):
+    ''' (host, port) of a 'host:port' or ':port' address, None for the path of
+        a unix socket. The api has no authentication, so a host that is not
+        localhost or a loopback address is refused with a ValueError
+    '''
+    host, _, port = address.rpartition(':')
+    if not port.isdigit():
+        return None
+
+    host = host.strip('[]') if host else 'localhost'
+    if host != 'localhost':
+        try:
+            loopback = ipaddress.ip_address(host).is_loopback
+
+        except ValueError:
+            loopback = False
+
+        if not loopback:
+            raise ValueError(f'control address must be on localhost: {address}')
+
+    return host, int(port)
+
+
+class ControlServer:
+    ''' Control api of a running player over a unix socket or localhost tcp,
+        one json object per line. A request {"id": 1, "command": "pl_play_next",
+        "args": []} is answered with {"id": 1, "result": ...} or {"id": 1,
+        "error": ...}; after {"command": "subscribe"} the client is sent
+        {"status": {...}} whenever the status changes.
+        The server runs on an asyncio loop, in the daemon its loop and next to
+        the Tk gui on a thread of its own. Commands are posted to the
+        dispatcher of the controller, so they run on its thread; the status is
+        taken once per interval for all subscribers and a subscriber that does
+        not keep up misses updates
+    '''
+    def __init__(self, controller, address, status_interval=STATUS_INTERVAL):
+        self.controller = controller
+        self.address = address
+        self.host_port = address_of(address)
+        self.status_interval = status_interval
+        self.clients = set()
+        self.subscribers = set()
+        self.subscribed = None
+        self.server = None
+        self.status_task = None
+        self.stopped = None
+        self.loop = None
+        self.thread = None
+
+    def call(self, method, *args):
+        future = Future()
+
+        def run():
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(getattr(self.controller, method)(*args))
+
+                except Exception as error:
+                    future.set_exception(error)
+
+        self.controller.dispatcher.post(run)
+        return asyncio.wrap_future(future)
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.subscribed = asyncio.Event()
+        if self.host_port:
+            self.server = await asyncio.start_server(
+                self.handle_client, *self.host_port, backlog=BACKLOG)
+
+        else:
+            # a socket left behind by a player that did not close is removed
+            Path(self.address).unlink(missing_ok=True)
+            self.server = await asyncio.start_unix_server(
+                self.handle_client, self.address, backlog=BACKLOG)
+
+        self.status_task = asyncio.create_task(self.push_status())
+
+    async def close(self):
+        self.status_task.cancel()
+        self.server.close()
+        for writer in self.clients:
+            writer.close()
+        self.clients.clear()
+        self.subscribers.clear()
+        await self.server.wait_closed()
+        if not self.host_port:
+            Path(self.address).unlink(missing_ok=True)
+
+    async def serve(self, started=None):
+        self.stopped = asyncio.Event()
+        await self.start()
+        if started:
+            started.set()
+
+        await self.stopped.wait()
+        await self.close()
+
+    def start_thread(self):
+        ''' serve on a thread with its own event loop, next to the Tk mainloop
+        '''
+        started = threading.Event()
+        self.thread = threading.Thread(
+            target=asyncio.run, args=(self.serve(started),), daemon=True,
+            name='youtube_player_control')
+        self.thread.start()
+        started.wait()
+
+    def stop_thread(self):
+        if self.thread:
+            self.loop.call_soon_threadsafe(self.stopped.set)
+            self.thread.join()
+            self.thread = None
+
+    async def handle_client(self, reader, writer):
+        # a request longer than the limit of the reader is answered with an
+        # error and the client is closed, the rest of the line can not be
+        # told from the next request
+        self.clients.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+
+                except ValueError as error:
+                    writer.write(self.encode({'error': f'invalid request: {error}'}))
+                    await writer.drain()
+                    break
+
+                if not line:
+                    break
+
+                if reply := await self.request(line, writer):
+                    writer.write(self.encode(reply))
+                    await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            self.clients.discard(writer)
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def request(self, line, writer):
+        try:
+            request = json.loads(line)
+            command = str(request['command'])
+            args = request.get('args', [])
+
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            return {'error': f'invalid request: {error!r}'}
+
+        reply = {'id': request.get('id')}
+        match command:
+            case 'subscribe':
+                self.subscribers.add(writer)
+                self.subscribed.set()
+                reply['result'] = True
+            case 'unsubscribe':
+                self.subscribers.discard(writer)
+                reply['result'] = True
+            case _ if command in COMMANDS:
+                try:
+                    reply['result'] = await self.call(command, *args)
+
+                except Exception as error:
+                    reply['error'] = repr(error)
+            case _:
+                reply['error'] = f'unknown command: {command}'
+
+        return reply
+
+    async def push_status(self):
+        # without subscribers the status is not taken at all
+        last_status = None
+        while True:
+            if not self.subscribers:
+                last_status = None
+                self.subscribed.clear()
+                await self.subscribed.wait()
+
+            await asyncio.sleep(self.status_interval)
+
+            try:
+                status = await self.call('status')
+
+            except Exception as error:
+                print(f'status failed: {error}')
+                continue
+
+            if status != last_status:
+                last_status = status
+                self.broadcast({'status': status})
+
+    def broadcast(self, message):
+        line = self.encode(message)
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.subscribers.discard(writer)
+
+            elif writer.transport.get_write_buffer_size() < MAX_WRITE_BUFFER:
+                writer.write(line)
+
+    @staticmethod
+    def encode(message):
+        return (json.dumps(message, default=str) + '\n').encode()
@@ -0,0 +1,158 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import random
+
+
+class ShuffleSet:
+    ''' Set with O(1) add, remove and uniform random choice. The items are kept
+        in a list with a map of item to list index; an item is removed by
+        moving the last item of the list into its place
+    '''
+    def __init__(self, items=(), rng=None):
+        self.items = []
+        self.index = {}
+        self.rng = rng if rng else random.Random()
+        self.update(items)
+
+    def add(self, item):
+        if item not in self.index:
+            self.index[item] = len(self.items)
+            self.items.append(item)
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def discard(self, item):
+        if (index := self.index.pop(item, None)) is None:
+            return
+
+        last_item = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last_item
+            self.index[last_item] = index
+
+    def remove(self, item):
+        if item not in self.index:
+            raise KeyError(item)
+
+        self.discard(item)
+
+    def choice(self):
+        return self.items[self.rng.randrange(len(self.items))]
+
+    def clear(self):
+        self.items = []
+        self.index = {}
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class ShuffleOrder:
+    ''' Shuffled order of the video ids of a playlist, with back and forward
+        through the songs drawn so far. The order is drawn lazily with a Fisher-Yates
+        shuffle on a virtual copy of the playlist: only swapped slots are
+        stored, so starting a shuffle of a huge playlist costs nothing. Songs
+        appended to the playlist join the undrawn songs; removing a song turns
+        the undrawn songs into a ShuffleSet once, as the playlist shifts.
+        With a seed the order is reproducible
+    '''
+    def __init__(self, playlist, seed=None):
+        self.playlist = playlist
+        self.rng = random.Random(seed)
+        self.size = len(playlist)
+        self.drawn = 0
+        self.swaps = {}
+        self.pool = None
+        self.history = []
+        self.position = -1
+
+    def slot(self, index):
+        if (video_id := self.swaps.get(index)) is not None:
+            return video_id
+
+        return self.playlist.video_ids[index]
+
+    def draw(self):
+        if self.pool is not None:
+            if not self.pool:
+                return None
+
+            video_id = self.pool.choice()
+            self.pool.discard(video_id)
+            return video_id
+
+        if self.drawn >= self.size:
+            return None
+
+        index = self.rng.randrange(self.drawn, self.size)
+        video_id = self.slot(index)
+        self.swaps[index] = self.slot(self.drawn)
+        self.swaps.pop(self.drawn, None)
+        self.drawn += 1
+        return video_id
+
+    def new_round(self):
+        self.size = len(self.playlist)
+        self.drawn = 0
+        self.swaps = {}
+        self.pool = None
+
+    def next(self):
+        if self.position + 1 < len(self.history):
+            self.position += 1
+            return self.history[self.position]
+
+        if (video_id := self.draw()) is None:
+            # all songs have been drawn, start a new shuffle
+            self.new_round()
+            if (video_id := self.draw()) is None:
+                return None
+
+        self.history.append(video_id)
+        self.position += 1
+        return video_id
+
+    def prev(self):
+        if self.position > 0:
+            self.position -= 1
+            return self.history[self.position]
+
+        return None
+
+    def add(self, video_id):
+        if self.pool is None:
+            self.size += 1
+
+        else:
+            self.pool.add(video_id)
+
+    def remove(self, video_id, last=True):
+        ''' remove video_id from the order; must be called before the song is
+            removed from the playlist. If it is not the last entry of
+            video_id in the playlist, the video id stays in the order
+        '''
+        if self.pool is None:
+            self.pool = ShuffleSet(
+                (self.slot(index) for index in range(self.drawn, self.size)), rng=self.rng)
+            self.swaps = {}
+
+        if not last:
+            return
+
+        self.pool.discard(video_id)
+        removed_before = sum(
+            1 for index, history_id in enumerate(self.history)
+            if history_id == video_id and index <= self.position
+        )
+        self.history = [history_id for history_id in self.history if history_id != video_id]
+        self.position -= removed_before
@@ -0,0 +1,89 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import sys
+from urllib.parse import urlparse, parse_qs
+
+YOUTUBE_BASE_URL = 'https://www.youtube.com'
+WATCH_URL = YOUTUBE_BASE_URL + '/watch?v='
+UNKNOWN_DURATION = -1
+MAX_SONG_LENGTH = 300
+
+
+def video_id(url: str) -> str:
+    ''' video id of a youtube watch url, other urls are their own id
+    '''
+    # plain watch urls, as saved in playlists, are sliced instead of parsed
+    if url.startswith(WATCH_URL) and '&' not in url and '#' not in url:
+        return url[len(WATCH_URL):]
+
+    if ids := parse_qs(urlparse(url).query).get('v'):
+        return ids[0]
+
+    return url
+
+
+def parse_duration(duration) -> int:
+    ''' seconds of a duration 'h:mm:ss' or 'm:ss', UNKNOWN_DURATION if the
+        duration is missing or malformed (for example of live streams)
+    '''
+    try:
+        seconds = 0
+        for part in duration.split(':'):
+            seconds = seconds * 60 + int(part)
+
+    except (AttributeError, ValueError):
+        return UNKNOWN_DURATION
+
+    return seconds
+
+
+def song_is_short(seconds: int, max_length: int=MAX_SONG_LENGTH) -> bool:
+    return 0 <= seconds < max_length
+
+
+def format_duration(seconds: int) -> str:
+    if seconds < 0:
+        return ''
+
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f'{hours}:{minutes:02d}:{seconds:02d}'
+
+    return f'{minutes}:{seconds:02d}'
+
+
+class Song:
+    ''' Compact record of a song: the video id, the title (interned, as the
+        same titles recur across search results and playlists) and the
+        duration in seconds. Converts from and to the playlist json format
+        {'url': ..., 'title': ..., 'duration': 'h:mm:ss'}
+    '''
+    __slots__ = ('video_id', 'title', 'seconds')
+
+    def __init__(self, video_id, title, seconds=UNKNOWN_DURATION):
+        self.video_id = video_id
+        self.title = sys.intern(title)
+        self.seconds = seconds
+
+    @classmethod
+    def from_dict(cls, song_dict):
+        return cls(
+            video_id(song_dict['url']), song_dict['title'],
+            parse_duration(song_dict.get('duration')))
+
+    def to_dict(self):
+        return {'url': self.url, 'title': self.title, 'duration': self.duration}
+
+    @property
+    def url(self) -> str:
+        return WATCH_URL + self.video_id
+
+    @property
+    def duration(self) -> str:
+        return format_duration(self.seconds)
+
+    def __repr__(self):
+        return f'Song({self.video_id!r}, {self.title!r}, {self.seconds})'
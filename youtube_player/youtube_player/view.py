@@ -7,20 +7,24 @@ from tkinter import (
     Tk, Menu, Frame, Label, Button, Scale, Entry, DISABLED, StringVar,
     filedialog
 )
+from youtube_player.worker import Waker
 
 class TkGuiView(Tk):
     ''' Tkinter GUI view for the youtube player
     '''
     geometry_window = '610x160'
     window_title = 'Youtube Player'
-    file_extensions = [('all types (*.*)', '*.*'), ('json type (*.json)', '*.json')]
+    file_extensions = [
+        ('all types (*.*)', '*.*'), ('json lines type (*.jsonl)', '*.jsonl'),
+        ('json type (*.json)', '*.json')]
     query_width = 30
     pl_width = 50
     length_progress_bar = 210
     progress_bar_resolution = 0.001
     length_volume_bar = 80
     max_volume_bar = 100
-    poll_time = 500
+    min_poll_time = 250
+    max_poll_time = 1000
 
     def __init__(self):
         super().__init__()
@@ -44,6 +48,10 @@ class TkGuiView(Tk):
         self.short_text.set('')
         self.auto_text = StringVar()
         self.auto_text.set('')
+        self.download_text = StringVar()
+        self.download_text.set('')
+        self.warm_text = StringVar()
+        self.warm_text.set('')
         self.pl_song_time_text = StringVar()
         self.pl_song_time_text.set(' / '.join([str(datetime.timedelta(0)),
             str(datetime.timedelta(0))]))
@@ -53,7 +61,12 @@ class TkGuiView(Tk):
         self.set_query_frame()
         self.set_pl_frame()
         self.set_status_frame()
-        self.poll_song_status()
+        self.poll_id = None
+        self.bind('<Map>', lambda _: self.start_polling())
+        # callbacks posted by worker threads are dispatched on a virtual
+        # event, which the waker generates; there is no polling
+        self.waker = Waker(lambda: self.event_generate('<<Dispatch>>', when='tail'))
+        self.bind('<<Dispatch>>', lambda _: self.dispatch_callbacks())
 
     def set_menubar(self):
         menubar = Menu(self)
@@ -96,6 +109,12 @@ class TkGuiView(Tk):
             label='all results to playlist', command=self.import_all_to_playlist)
         self.playlist_menu.add_command(
             label='clear playlist', command=self.clear_playlist)
+        self.playlist_menu.add_command(
+            label='remove duplicates', command=self.dedupe_playlist)
+        self.playlist_menu.add_command(
+            label='download playlist', command=self.download_playlist)
+        self.playlist_menu.add_command(
+            label='warm playlist', command=self.warm_playlist)
 
     def set_query_frame(self):
         query_frame = Frame(self.main_frame)
@@ -162,10 +181,19 @@ class TkGuiView(Tk):
         Label(status_frame, textvariable=self.auto_text, anchor='w', width=3).pack(side='left')
         Label(status_frame, text='Q:', anchor='w', width=2).pack(side='left')
         Label(status_frame, textvariable=self.quality_text, anchor='w', width=10).pack(side='left')
+        Label(status_frame, text='DL:', anchor='w', width=3).pack(side='left')
+        Label(status_frame, textvariable=self.download_text, anchor='w', width=10).pack(side='left')
+        Label(status_frame, text='Warm:', anchor='w', width=5).pack(side='left')
+        Label(status_frame, textvariable=self.warm_text, anchor='w', width=16).pack(side='left')
 
     def set_controller(self, controller):
         self.controller = controller
         self.set_initial_values()
+        self.controller.dispatcher.wakeup = self.waker.wake
+        self.waker.start()
+        # the main loop may not run yet, when an event generated by the waker
+        # fails; callbacks posted until then are dispatched once it runs
+        self.after_idle(self.dispatch_callbacks)
 
     def set_initial_values(self):
         if self.controller:
@@ -218,11 +246,34 @@ class TkGuiView(Tk):
         if self.controller:
             self.controller.clear_playlist()
 
+    def dedupe_playlist(self):
+        if self.controller:
+            self.controller.dedupe_playlist()
+
     def query_songs(self, _):
         if self.controller:
-            title = self.controller.query_songs(str(self.query_text_entry.get()))
-            title = title if title else ''
-            self.query_song_title.set(title)
+            self.query_song_title.set('')
+            self.controller.query_songs(str(self.query_text_entry.get()))
+
+    def download_playlist(self):
+        if self.controller:
+            directory = filedialog.askdirectory(title='Download to directory')
+            if directory:
+                self.controller.download_playlist(directory)
+
+    def show_download_progress(self, done, total):
+        self.download_text.set(f'{done}/{total}' if total else '')
+
+    def warm_playlist(self):
+        if self.controller:
+            self.controller.warm_playlist()
+
+    def show_warm_progress(self, done, total, dead):
+        text = f'{done}/{total}' if total else ''
+        self.warm_text.set(f'{text} ({dead} dead)' if dead else text)
+
+    def query_show_title(self, title):
+        self.query_song_title.set(title if title else '')
 
     def query_prev(self):
         if self.controller:
@@ -260,14 +311,17 @@ class TkGuiView(Tk):
 
             else:
                 self.pl_play_pause_button.config(text='||')
+                self.start_polling()
 
     def pl_song_back(self):
         if self.controller:
             self.controller.pl_song_back()
+            self.show_song_status()
 
     def pl_song_forward(self):
         if self.controller:
             self.controller.pl_song_forward()
+            self.show_song_status()
 
     def pl_prev(self):
         if self.controller:
@@ -292,6 +346,8 @@ class TkGuiView(Tk):
         if title:
             self.pl_current_title.set(title)
             self.quality_text.set(quality)
+            # a new song started, poll its progress
+            self.start_polling()
 
         else:
             self.pl_current_title.set('')
@@ -308,19 +364,38 @@ class TkGuiView(Tk):
                 self.volume_bar.get()
             )
 
-    def poll_song_status(self):
-        if self.controller:
-            time, length = self.controller.update_song_status()
-            self.pl_song_time_text.set(' / '.join([
-                str(datetime.timedelta(seconds=int(time))),
-                str(datetime.timedelta(seconds=int(length)))]))
+    def show_song_status(self):
+        time, length = self.controller.update_song_status()
+        self.pl_song_time_text.set(' / '.join([
+            str(datetime.timedelta(seconds=int(time))),
+            str(datetime.timedelta(seconds=int(length)))]))
+
+        self.progress_bar.set(time / length / self.progress_bar_resolution
+            if length > 0 else 0.0)
+        return length
 
-            self.progress_bar.set(time / length / self.progress_bar_resolution
-                if length > 0 else 0.0)
+    def start_polling(self):
+        if self.poll_id is None:
+            self.poll_id = self.after_idle(self.poll_song_status)
 
-        self.after(self.poll_time, self.poll_song_status)
+    def poll_song_status(self):
+        # the end of a song is signalled by a player event, polling only
+        # updates the progress and stops while paused or minimised
+        if not (self.controller and self.controller.playing) or self.state() == 'iconic':
+            self.poll_id = None
+            return
+
+        length = self.show_song_status()
+        poll_time = int(length * 1000 / self.length_progress_bar)
+        poll_time = min(max(poll_time, self.min_poll_time), self.max_poll_time)
+        self.poll_id = self.after(poll_time, self.poll_song_status)
+
+    def dispatch_callbacks(self):
+        if self.controller:
+            self.controller.dispatch_callbacks()
 
     def exit(self):
+        self.waker.stop()
         self.after(500, self.destroy)
 
 
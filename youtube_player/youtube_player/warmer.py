@@ -0,0 +1,115 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+WARM_WORKERS = 3
+WARM_RATE = 2.0
+
+
+class RateLimiter:
+    ''' Spaces out calls from any number of threads to at most rate calls per
+        second; wait blocks until the next call is due
+    '''
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = self.clock()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+
+        if start > now:
+            self.sleep(start - now)
+
+
+class PlaylistWarmer:
+    ''' Resolves the audio formats of all songs of a playlist ahead of playing
+        them, with a bounded pool of workers and a rate limit on the requests
+        to YouTube. Songs in the stream cache are not requested again.
+        on_song(index, song, resolved, error) is called from the worker
+        threads for every song, with the song as resolved (title and duration
+        as on YouTube) or the error that makes the song unplayable. Cancel
+        stops after the songs being resolved
+    '''
+    def __init__(self, model, workers=WARM_WORKERS, rate=WARM_RATE, on_song=None):
+        self.model = model
+        self.workers = workers
+        self.on_song = on_song
+        self.limiter = RateLimiter(rate)
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='youtube_warmer')
+        self.cancelled = False
+        self.total = 0
+        self.done = 0
+        self.dead = 0
+        self.lock = threading.Lock()
+
+    def warm(self, songs):
+        # the workers take the songs from one iterator, so a long playlist
+        # is not queued up song by song
+        self.total = len(songs)
+        if not songs:
+            self.executor.shutdown(wait=False)
+            return
+
+        songs = iter(enumerate(songs))
+        for _ in range(self.workers):
+            self.executor.submit(self.run, songs)
+
+    def run(self, songs):
+        while not self.cancelled:
+            with self.lock:
+                index, song = next(songs, (None, None))
+
+            if song is None:
+                return
+
+            self.resolve(index, song)
+
+    def resolve(self, index, song):
+        resolved = error = None
+        try:
+            if self.model.cached_audio_formats(song.url) is None:
+                self.limiter.wait()
+                resolved = self.model.resolve_song(song)
+
+            else:
+                resolved = song
+
+        except Exception as error_:
+            error = error_
+
+        with self.lock:
+            self.done += 1
+            if error is not None:
+                self.dead += 1
+
+        # the threads of the workers end with the last song
+        if self.done >= self.total:
+            self.executor.shutdown(wait=False)
+
+        if self.on_song:
+            self.on_song(index, song, resolved, error)
+
+    def progress(self):
+        ''' number of songs resolved, total number of songs and number of
+            songs that can not be played
+        '''
+        return self.done, self.total, self.dead
+
+    @property
+    def finished(self) -> bool:
+        return self.cancelled or self.done >= self.total
+
+    def cancel(self):
+        self.cancelled = True
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,113 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 2
+
+
+class Dispatcher:
+    ''' Thread safe queue of callbacks. Worker threads post callbacks, the gui
+        thread runs them by calling dispatch from its event loop. The event
+        loop sets wakeup, which is called on every post, to be woken from
+        the posting thread (a Waker for Tk, call_soon_threadsafe for asyncio)
+    '''
+    def __init__(self):
+        self.callbacks = queue.SimpleQueue()
+        self.wakeup = None
+
+    def post(self, callback, *args):
+        self.callbacks.put((callback, args))
+        if self.wakeup:
+            self.wakeup()
+
+    def dispatch(self):
+        count = 0
+        while True:
+            try:
+                callback, args = self.callbacks.get_nowait()
+
+            except queue.Empty:
+                return count
+
+            callback(*args)
+            count += 1
+
+
+class Waker:
+    ''' Calls notify on a thread of its own after wake, so the threads that
+        post callbacks, the libvlc event thread among them, never wait for
+        the gui thread. Wakes that come before notify has run are folded
+        into one. An error of notify, as when the gui thread is not yet in
+        its main loop, is reported and the thread waits for the next wake;
+        only stop ends it
+    '''
+    def __init__(self, notify):
+        self.notify = notify
+        self.woken = threading.Event()
+        self.stopped = False
+        self.thread = threading.Thread(
+            target=self.run, daemon=True, name='youtube_player_waker')
+
+    def start(self):
+        self.thread.start()
+
+    def wake(self):
+        self.woken.set()
+
+    def stop(self):
+        self.stopped = True
+        self.woken.set()
+
+    def run(self):
+        while True:
+            self.woken.wait()
+            self.woken.clear()
+            if self.stopped:
+                return
+
+            try:
+                self.notify()
+
+            except Exception as error:
+                print(f'wakeup failed: {error}')
+
+
+class WorkerPool:
+    ''' Pool of worker threads for blocking calls (yt-dlp, youtube search). The
+        result of a call is returned as a future; if a callback is given it is
+        posted to the dispatcher with the completed future
+    '''
+    def __init__(self, dispatcher, max_workers=MAX_WORKERS):
+        self.dispatcher = dispatcher
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='youtube_player')
+        self.lock = threading.Lock()
+        self.pending = 0
+
+    def submit(self, func, *args, callback=None):
+        with self.lock:
+            self.pending += 1
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(self.done)
+        if callback:
+            self.add_callback(future, callback)
+        return future
+
+    def add_callback(self, future, callback):
+        future.add_done_callback(
+            lambda future: self.dispatcher.post(callback, future))
+
+    def done(self, _):
+        with self.lock:
+            self.pending -= 1
+
+    @property
+    def busy(self) -> bool:
+        return self.pending > 0
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -2,17 +2,30 @@
 Gui YouTube player: based on question
 https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
 '''
+import argparse
 from youtube_player.model import YouTubePlayerModel
 from youtube_player.view import TkGuiView
 from youtube_player.controller import Controller
+from youtube_player.server import ControlServer
 
 class App:
-    def __init__(self):
+    def __init__(self, control=None):
         model = YouTubePlayerModel()
         view = TkGuiView()
         controller = Controller(model, view)
         view.set_controller(controller)
+        server = ControlServer(controller, control) if control else None
+        if server:
+            server.start_thread()
         view.mainloop()
+        if server:
+            server.stop_thread()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='youtube player')
+    parser.add_argument(
+        '--control', help='serve the control api on a unix socket path or host:port')
+    return parser.parse_args()
 
 if __name__ == '__main__':
-    app = App()
+    app = App(parse_args().control)
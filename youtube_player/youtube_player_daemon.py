@@ -0,0 +1,35 @@
+'''
+Gui YouTube player: based on question
+https://codereview.stackexchange.com/questions/282051/a-gui-youtube-audio-player/282130#282130
+'''
+import asyncio
+import argparse
+from youtube_player.model import YouTubePlayerModel
+from youtube_player.daemon import Daemon
+
+class App:
+    ''' Headless player: plays a playlist without a window, stop with ctrl-c
+        or SIGTERM
+    '''
+    def __init__(self, args):
+        model = YouTubePlayerModel()
+        daemon = Daemon(model, control=args.control)
+        calls = [('open_playlist', args.playlist)]
+        if args.shuffle:
+            calls.append(('toggle_shuffle',))
+        if args.volume is not None:
+            calls.append(('set_volume', args.volume))
+        calls.append(('pl_play_next',))
+        asyncio.run(daemon.run(*calls))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='headless youtube player')
+    parser.add_argument('playlist', help='playlist file to play')
+    parser.add_argument('--shuffle', action='store_true', help='play in shuffled order')
+    parser.add_argument('--volume', type=int, help='volume 0 - 100')
+    parser.add_argument(
+        '--control', help='serve the control api on a unix socket path or host:port')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    app = App(parse_args())